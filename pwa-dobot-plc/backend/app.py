@@ -35,6 +35,9 @@ COUNTER_IMAGES_DIR = os.path.expanduser('~/counter_images')
 COUNTER_POSITIONS_FILE = os.path.join(COUNTER_IMAGES_DIR, 'counter_positions.json')
 COUNTER_DEFECTS_FILE = os.path.join(COUNTER_IMAGES_DIR, 'counter_defects.json')
 
+# Structuring element for defect mask cleanup (built once, not per analysed image)
+DEFECT_MORPH_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+
 # Track last save time for each counter (to enforce 15-second interval)
 counter_last_save_time = {}  # counter_number -> timestamp
 
@@ -176,7 +179,7 @@ def call_vision_service(frame: np.ndarray, params: Dict) -> Dict:
                 'error': 'Failed to encode frame'
             }
         
-        frame_base64 = base64.b64encode(buffer.tobytes()).decode('utf-8')
+        frame_base64 = base64.b64encode(buffer).decode('utf-8')  # Reads the encoded buffer directly, no bytes copy
         
         # Call vision service
         response = requests.post(
@@ -317,20 +320,23 @@ def find_matching_counter(obj: Dict, existing_counters: Dict[int, Dict]) -> int:
     
     # Position matching threshold (pixels) - counters within this distance are considered the same
     POSITION_THRESHOLD = 100  # 100 pixels tolerance
+    threshold_sq = POSITION_THRESHOLD * POSITION_THRESHOLD
     
     best_match = None
-    best_distance = float('inf')
+    best_distance_sq = float('inf')
     
     for counter_num, counter_info in existing_counters.items():
         counter_center = counter_info.get('center', (counter_info.get('x', 0), counter_info.get('y', 0)))
         counter_x, counter_y = counter_center
         
-        # Calculate distance between centers
-        distance = ((obj_x - counter_x) ** 2 + (obj_y - counter_y) ** 2) ** 0.5
+        # Squared distance between centers (same ordering as the distance, no sqrt needed)
+        dx = obj_x - counter_x
+        dy = obj_y - counter_y
+        distance_sq = dx * dx + dy * dy
         
-        if distance < POSITION_THRESHOLD and distance < best_distance:
+        if distance_sq < threshold_sq and distance_sq < best_distance_sq:
             best_match = counter_num
-            best_distance = distance
+            best_distance_sq = distance_sq
     
     return best_match
 
@@ -587,7 +593,8 @@ def init_clients():
     dobot_config = config['dobot']
     dobot_client = DobotClient(
         use_usb=dobot_config.get('use_usb', True),
-        usb_path=dobot_config.get('usb_path', '/dev/ttyACM0')
+        usb_path=dobot_config.get('usb_path', '/dev/ttyACM0'),
+        low_latency=dobot_config.get('low_latency', True)
     )
     
     # Update home position if specified
@@ -599,7 +606,10 @@ def init_clients():
     camera_service = CameraService(
         camera_index=camera_config.get('index', 0),
         width=camera_config.get('width', 640),
-        height=camera_config.get('height', 480)
+        height=camera_config.get('height', 480),
+        capture_thread=camera_config.get('capture_thread', False),
+        picamera2=camera_config.get('picamera2', False),
+        yuv_capture=camera_config.get('yuv_capture', False)
     )
     # Initialize camera (but don't fail if camera not available)
     try:
@@ -1358,6 +1368,8 @@ def write_plc_fault_bit(defects_found: bool):
 
 def generate_frames():
     """Generator function for MJPEG streaming"""
+    part_header = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+    part_trailer = b'\r\n'
     while True:
         if camera_service is None:
             break
@@ -1367,8 +1379,8 @@ def generate_frames():
             time.sleep(0.05)  # Reduced sleep time when no frame available
             continue
         
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+        # Single join: chained + would copy the JPEG payload twice per frame
+        yield b''.join((part_header, frame_bytes, part_trailer))
         time.sleep(0.05)  # ~20 FPS - reduced for faster initial load
 
 @app.route('/api/camera/stream')
@@ -1438,6 +1450,7 @@ def camera_connect():
             # Update config
             config = load_config()
             config['camera'] = {
+                **config.get('camera', {}),
                 'index': camera_index,
                 'width': width,
                 'height': height
@@ -1515,12 +1528,10 @@ def vision_detect_objects():
         
         # Optionally draw objects on frame
         if data.get('annotate', False) and results['objects_found']:
-            annotated_frame = camera_service.draw_objects(frame, results['objects'])
-            # Encode annotated frame
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 85]
-            ret, buffer = cv2.imencode('.jpg', annotated_frame, encode_param)
-            if ret:
-                results['annotated_image'] = buffer.tobytes().hex()
+            # Drawn into the camera service's reused annotation buffer and encoded there
+            jpeg_bytes = camera_service.annotate_jpeg(frame, results['objects'], quality=85)
+            if jpeg_bytes is not None:
+                results['annotated_image'] = jpeg_bytes.hex()
         
         return jsonify(results)
     except Exception as e:
@@ -1645,14 +1656,15 @@ def vision_analyze():
                 save_counter_positions(all_positions)
             
             # Extract ROI regions from detected objects
+            frame_h, frame_w = frame.shape[:2]
+            padding = object_params.get('roi_padding', 10)
             for obj in detected_objects:
                 x, y = obj['x'], obj['y']
                 w, h = obj['width'], obj['height']
-                padding = object_params.get('roi_padding', 10)
                 x1 = max(0, x - padding)
                 y1 = max(0, y - padding)
-                x2 = min(frame.shape[1], x + w + padding)
-                y2 = min(frame.shape[0], y + h + padding)
+                x2 = min(frame_w, x + w + padding)
+                y2 = min(frame_h, y + h + padding)
                 roi_regions.append((x1, y1, x2, y2))
         
         # Return object detection results only (defect detection disabled)
@@ -1668,21 +1680,15 @@ def vision_analyze():
         
         results['detected_objects'] = detected_objects
         
-        # Draw objects on frame
-        annotated_frame = frame.copy()
-        if detected_objects:
-            annotated_frame = camera_service.draw_objects(annotated_frame, detected_objects, color=(0, 255, 0))
-        
-        # Encode as JPEG
-        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 90]
-        ret, buffer = cv2.imencode('.jpg', annotated_frame, encode_param)
+        # Draw objects on a reused copy of the frame and encode it (frame itself is left untouched)
+        jpeg_bytes = camera_service.annotate_jpeg(frame, detected_objects, quality=90)
         
-        if not ret:
+        if jpeg_bytes is None:
             return jsonify({'error': 'Failed to encode annotated image'}), 500
         
         # Return both JSON results and image
         return Response(
-            buffer.tobytes(),
+            jpeg_bytes,
             mimetype='image/jpeg',
             headers={
                 'X-Defect-Count': str(results['defect_count']),
@@ -2042,9 +2048,8 @@ def detect_color_defects(image: np.ndarray) -> Dict:
         defect_mask_uint8 = (defect_mask * 255).astype(np.uint8)
         
         # Apply morphological operations to connect nearby defect pixels and remove noise
-        kernel = np.ones((5, 5), np.uint8)
-        defect_mask_uint8 = cv2.morphologyEx(defect_mask_uint8, cv2.MORPH_CLOSE, kernel)  # Connect nearby defects
-        defect_mask_uint8 = cv2.morphologyEx(defect_mask_uint8, cv2.MORPH_OPEN, kernel)   # Remove small noise
+        cv2.morphologyEx(defect_mask_uint8, cv2.MORPH_CLOSE, DEFECT_MORPH_KERNEL, dst=defect_mask_uint8)  # Connect nearby defects
+        cv2.morphologyEx(defect_mask_uint8, cv2.MORPH_OPEN, DEFECT_MORPH_KERNEL, dst=defect_mask_uint8)   # Remove small noise
         
         # Find contours of defect regions
         contours, _ = cv2.findContours(defect_mask_uint8, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -0,0 +1,457 @@
+"""
+Compiled helper kernels for the camera pipeline
+Uses Numba when installed; every kernel has a NumPy fallback that returns the same result
+
+Numba kernels are declared with explicit signatures, so they are compiled (or loaded from
+NUMBA_CACHE_DIR) when this module is imported rather than on the first camera frame.
+"""
+
+import logging
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Try to import Numba (optional)
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+    logger.info("Numba loaded - camera kernels will be JIT compiled")
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not available - using NumPy camera kernels (install with: pip install numba)")
+
+# Try to import SciPy KD-tree and csgraph (optional, used for neighbour queries and grouping)
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def _filter_contours_numpy(stats: np.ndarray, min_area: int, max_area: int,
+                           ar_min: float, ar_max: float) -> np.ndarray:
+    """NumPy version of filter_contours"""
+    widths = stats[:, 2]
+    heights = stats[:, 3]
+    areas = stats[:, 4]
+    aspect = np.where(heights > 0, widths / np.maximum(heights, 1), 0)
+    keep = (areas > min_area) & (areas < max_area) & (aspect >= ar_min) & (aspect <= ar_max)
+    return np.nonzero(keep)[0].astype(np.int32)
+
+
+if NUMBA_AVAILABLE:
+    @njit('i4[:](f4[:, ::1], i8, i8, f4, f4)', cache=True, fastmath=True, boundscheck=False)
+    def _filter_contours_numba(stats, min_area, max_area, ar_min, ar_max):
+        n = stats.shape[0]
+        keep = np.empty(n, dtype=np.int32)
+        count = 0
+        for i in range(n):
+            area = stats[i, 4]
+            if area <= min_area or area >= max_area:
+                continue
+            h = stats[i, 3]
+            aspect = stats[i, 2] / h if h > 0 else 0.0
+            if aspect < ar_min or aspect > ar_max:
+                continue
+            keep[count] = i
+            count += 1
+        return keep[:count]
+
+
+def filter_contours(stats: np.ndarray, min_area: int, max_area: int,
+                    ar_min: float, ar_max: float) -> np.ndarray:
+    """
+    Select contours by area and bounding-box aspect ratio
+
+    Args:
+        stats: C-contiguous float32 array of shape (n, 5) with columns x, y, w, h, area
+        min_area: Exclusive lower area bound
+        max_area: Exclusive upper area bound
+        ar_min: Inclusive lower bound for w / h
+        ar_max: Inclusive upper bound for w / h
+
+    Returns:
+        int32 array of indices of the rows that pass
+    """
+    if NUMBA_AVAILABLE:
+        return _filter_contours_numba(stats, int(min_area), int(max_area), float(ar_min), float(ar_max))
+    return _filter_contours_numpy(stats, min_area, max_area, ar_min, ar_max)
+
+
+def _union_find_numpy(n: int, pairs: np.ndarray) -> np.ndarray:
+    """NumPy version of union_find (min-label propagation over the pair list)"""
+    labels = np.arange(n, dtype=np.int32)
+    if len(pairs) == 0:
+        return labels
+    a = pairs[:, 0]
+    b = pairs[:, 1]
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, a, labels[b])
+        np.minimum.at(new_labels, b, labels[a])
+        # Pointer jumping: follow labels to their own labels to shorten long chains
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            return labels
+        labels = new_labels
+
+
+def _union_find_scipy(n: int, pairs: np.ndarray) -> np.ndarray:
+    """SciPy version of union_find (compiled connected-components pass over a sparse adjacency)"""
+    if len(pairs) == 0:
+        return np.arange(n, dtype=np.int32)
+    adjacency = coo_matrix((np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    _, components = connected_components(adjacency, directed=False)
+    # Relabel each component by its smallest member (first occurrence in index order)
+    _, first = np.unique(components, return_index=True)
+    return first[components].astype(np.int32)
+
+
+if NUMBA_AVAILABLE:
+    @njit('i4[:](i8, i4[:, ::1])', cache=True, boundscheck=False)
+    def _union_find_numba(n, pairs):
+        parent = np.arange(n, dtype=np.int32)
+        for k in range(pairs.shape[0]):
+            # Find both roots with path halving
+            a = pairs[k, 0]
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = pairs[k, 1]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+            # Smaller index becomes the root, so labels match the NumPy version
+            if a < b:
+                parent[b] = a
+            elif b < a:
+                parent[a] = b
+        # Parents always have smaller indices, so one ascending pass resolves every root
+        for i in range(n):
+            parent[i] = parent[parent[i]]
+        return parent
+
+
+def union_find(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Group n items into connected components given a list of linked pairs
+
+    Args:
+        n: Number of items
+        pairs: int32 array of shape (m, 2) with the indices of linked items
+
+    Returns:
+        int32 array of length n; each item's label is the smallest index in its component
+    """
+    pairs = np.ascontiguousarray(pairs, dtype=np.int32).reshape(-1, 2)
+    if NUMBA_AVAILABLE:
+        return _union_find_numba(n, pairs)
+    if SCIPY_AVAILABLE:
+        return _union_find_scipy(n, pairs)
+    return _union_find_numpy(n, pairs)
+
+
+def close_pairs(points: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Find all pairs of points closer than radius to each other
+
+    Uses a KD-tree (O(n log n)) when SciPy is installed, otherwise a pairwise distance matrix.
+
+    Args:
+        points: Array of shape (n, 2)
+        radius: Pairs must be strictly closer than this
+
+    Returns:
+        int32 array of shape (m, 2) with i < j for each pair
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return np.empty((0, 2), dtype=np.int32)
+    if SCIPY_AVAILABLE:
+        # query_pairs is inclusive; the next float below radius makes it strict
+        return cKDTree(points).query_pairs(np.nextafter(radius, 0), output_type='ndarray').astype(np.int32)
+    diff = points[:, None, :] - points[None, :, :]
+    d2 = np.einsum('ijk,ijk->ij', diff, diff)
+    return np.argwhere(np.triu(d2 < radius * radius, 1)).astype(np.int32)
+
+
+def _group_boxes_numpy(boxes: np.ndarray, group_ids: np.ndarray, num_groups: int) -> np.ndarray:
+    """NumPy version of group_boxes"""
+    out = np.empty((num_groups, 4), dtype=np.int32)
+    out[:, :2] = np.iinfo(np.int32).max
+    out[:, 2:] = np.iinfo(np.int32).min
+    np.minimum.at(out[:, 0], group_ids, boxes[:, 0])
+    np.minimum.at(out[:, 1], group_ids, boxes[:, 1])
+    np.maximum.at(out[:, 2], group_ids, boxes[:, 2])
+    np.maximum.at(out[:, 3], group_ids, boxes[:, 3])
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit('i4[:, ::1](i4[:, ::1], i8[::1], i8)', cache=True, boundscheck=False)
+    def _group_boxes_numba(boxes, group_ids, num_groups):
+        out = np.empty((num_groups, 4), dtype=np.int32)
+        for g in range(num_groups):
+            out[g, 0] = 2147483647
+            out[g, 1] = 2147483647
+            out[g, 2] = -2147483648
+            out[g, 3] = -2147483648
+        # One pass over the members; each box widens its group's box
+        for k in range(boxes.shape[0]):
+            g = group_ids[k]
+            out[g, 0] = min(out[g, 0], boxes[k, 0])
+            out[g, 1] = min(out[g, 1], boxes[k, 1])
+            out[g, 2] = max(out[g, 2], boxes[k, 2])
+            out[g, 3] = max(out[g, 3], boxes[k, 3])
+        return out
+
+
+def group_boxes(boxes: np.ndarray, group_ids: np.ndarray, num_groups: int) -> np.ndarray:
+    """
+    Union the boxes of each group into one enclosing box
+
+    Args:
+        boxes: Array of shape (n, 4) with corners x1, y1, x2, y2
+        group_ids: Group index (0..num_groups-1) of each box
+        num_groups: Number of groups
+
+    Returns:
+        int32 array of shape (num_groups, 4) with each group's enclosing x1, y1, x2, y2
+    """
+    boxes = np.ascontiguousarray(boxes, dtype=np.int32).reshape(-1, 4)
+    group_ids = np.ascontiguousarray(group_ids, dtype=np.int64)
+    if NUMBA_AVAILABLE:
+        return _group_boxes_numba(boxes, group_ids, num_groups)
+    return _group_boxes_numpy(boxes, group_ids, num_groups)
+
+
+def _not_blue_mask_numpy(frame: np.ndarray, out: np.ndarray, margin: int, min_blue: int) -> np.ndarray:
+    """NumPy version of not_blue_mask"""
+    b = frame[:, :, 0].astype(np.int16)
+    g = frame[:, :, 1].astype(np.int16)
+    r = frame[:, :, 2].astype(np.int16)
+    is_blue = (b > r + margin) & (b > g + margin) & (b > min_blue)
+    out[...] = 255
+    out[is_blue] = 0
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit('u1[:, ::1](u1[:, :, ::1], u1[:, ::1], i8, i8)', parallel=True, cache=True, fastmath=True,
+          boundscheck=False)
+    def _not_blue_mask_numba(frame, out, margin, min_blue):
+        h, w = out.shape
+        for i in prange(h):
+            for j in range(w):
+                b = np.int64(frame[i, j, 0])
+                g = np.int64(frame[i, j, 1])
+                r = np.int64(frame[i, j, 2])
+                if b > r + margin and b > g + margin and b > min_blue:
+                    out[i, j] = 0
+                else:
+                    out[i, j] = 255
+        return out
+
+
+def not_blue_mask(frame: np.ndarray, out: np.ndarray, margin: int = 20, min_blue: int = 80) -> np.ndarray:
+    """
+    Object mask straight from BGR in one pass: 0 where the pixel is blue background, 255 elsewhere.
+    A pixel is blue when B exceeds both G and R by more than margin and B > min_blue.
+
+    Args:
+        frame: C-contiguous uint8 BGR image (h, w, 3)
+        out: uint8 (h, w) output mask (written in place)
+        margin: Required lead of the blue channel over green and red
+        min_blue: Minimum blue value (rejects dark pixels)
+
+    Returns:
+        out
+    """
+    if NUMBA_AVAILABLE:
+        return _not_blue_mask_numba(frame, out, int(margin), int(min_blue))
+    return _not_blue_mask_numpy(frame, out, margin, min_blue)
+
+
+def _disc_stats_numpy(roi: np.ndarray):
+    """cv2/NumPy version of disc_stats"""
+    h, s, v = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV).mean(axis=(0, 1))
+    return float(h), float(s), float(v), float(np.var(roi))
+
+
+if NUMBA_AVAILABLE:
+    @njit('UniTuple(i8, 3)(i8, i8, i8)', cache=True, boundscheck=False)
+    def _pixel_hsv(b, g, r):
+        # Same fixed-point arithmetic (12-bit tables, H in 0..180) as cv2.COLOR_BGR2HSV
+        v = max(b, g, r)
+        diff = v - min(b, g, r)
+        s = 0
+        if v > 0:
+            s = (diff * int(round(255.0 * 4096 / v)) + 2048) >> 12
+        h = 0
+        if diff > 0:
+            if v == r:
+                h = g - b
+            elif v == g:
+                h = b - r + 2 * diff
+            else:
+                h = r - g + 4 * diff
+            h = (h * int(round(180.0 * 4096 / (6 * diff))) + 2048) >> 12
+            if h < 0:
+                h += 180
+        return h, s, v
+
+    @njit('UniTuple(f8, 4)(u1[:, :, :])', cache=True, fastmath=True, boundscheck=False)
+    def _disc_stats_numba(roi):
+        rows, cols, _ = roi.shape
+        h_sum = 0
+        s_sum = 0
+        v_sum = 0
+        total = 0
+        total_sq = 0
+        for i in range(rows):
+            for j in range(cols):
+                b = np.int64(roi[i, j, 0])
+                g = np.int64(roi[i, j, 1])
+                r = np.int64(roi[i, j, 2])
+                total += b + g + r
+                total_sq += b * b + g * g + r * r
+                h, s, v = _pixel_hsv(b, g, r)
+                h_sum += h
+                s_sum += s
+                v_sum += v
+        n = rows * cols
+        if n == 0:
+            return 0.0, 0.0, 0.0, 0.0
+        mean = total / (3.0 * n)
+        return h_sum / n, s_sum / n, v_sum / n, total_sq / (3.0 * n) - mean * mean
+
+    @njit('f8[:, ::1](u1[:, ::1], i8[::1])', parallel=True, cache=True, fastmath=True, boundscheck=False)
+    def _disc_stats_batch_numba(pixels, offsets):
+        count = offsets.shape[0] - 1
+        out = np.zeros((count, 4))
+        for k in prange(count):
+            start = offsets[k]
+            stop = offsets[k + 1]
+            n = stop - start
+            if n == 0:
+                continue
+            h_sum = 0
+            s_sum = 0
+            v_sum = 0
+            total = 0
+            total_sq = 0
+            for p in range(start, stop):
+                b = np.int64(pixels[p, 0])
+                g = np.int64(pixels[p, 1])
+                r = np.int64(pixels[p, 2])
+                total += b + g + r
+                total_sq += b * b + g * g + r * r
+                h, s, v = _pixel_hsv(b, g, r)
+                h_sum += h
+                s_sum += s
+                v_sum += v
+            mean = total / (3.0 * n)
+            out[k, 0] = h_sum / n
+            out[k, 1] = s_sum / n
+            out[k, 2] = v_sum / n
+            out[k, 3] = total_sq / (3.0 * n) - mean * mean
+        return out
+
+
+def disc_stats(roi: np.ndarray):
+    """
+    Mean H, S, V and BGR variance of a disc ROI in a single pass over the pixels
+
+    Args:
+        roi: uint8 BGR image (h, w, 3); may be a view into a larger frame
+
+    Returns:
+        Tuple (H mean, S mean, V mean, variance) on OpenCV's 8-bit HSV scale
+    """
+    if NUMBA_AVAILABLE:
+        return _disc_stats_numba(roi)
+    return _disc_stats_numpy(roi)
+
+
+def disc_stats_batch(rois) -> np.ndarray:
+    """
+    disc_stats for several ROIs at once; with Numba the discs are processed in parallel
+
+    Args:
+        rois: Sequence of non-empty uint8 BGR images (any sizes)
+
+    Returns:
+        float64 array of shape (n, 4) with H mean, S mean, V mean and variance per ROI
+    """
+    if not NUMBA_AVAILABLE:
+        return np.array([_disc_stats_numpy(roi) for roi in rois], dtype=np.float64).reshape(-1, 4)
+    # Pack every ROI's pixels into one (total, 3) array; offsets[k]:offsets[k + 1] belongs to ROI k
+    sizes = [roi.shape[0] * roi.shape[1] for roi in rois]
+    offsets = np.zeros(len(rois) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    pixels = np.empty((int(offsets[-1]), 3), dtype=np.uint8)
+    for k, roi in enumerate(rois):
+        pixels[offsets[k]:offsets[k + 1]] = roi.reshape(-1, 3)
+    return _disc_stats_batch_numba(pixels, offsets)
+
+
+def _fill_rects_numpy(image: np.ndarray, rects: np.ndarray, color: np.ndarray) -> np.ndarray:
+    """NumPy version of fill_rects"""
+    h, w = image.shape[:2]
+    for x1, y1, x2, y2 in rects.tolist():
+        if x2 >= 0 and y2 >= 0:  # Negative stops would wrap around
+            image[max(y1, 0):min(y2 + 1, h), max(x1, 0):min(x2 + 1, w)] = color
+    return image
+
+
+if NUMBA_AVAILABLE:
+    @njit('u1[:, :, ::1](u1[:, :, ::1], i4[:, ::1], u1[::1])', parallel=True, cache=True, boundscheck=False)
+    def _fill_rects_numba(image, rects, color):
+        h, w, channels = image.shape
+        # Overlapping rectangles write the same color, so parallel writes can't conflict
+        for k in prange(rects.shape[0]):
+            x1 = max(rects[k, 0], 0)
+            y1 = max(rects[k, 1], 0)
+            x2 = min(rects[k, 2] + 1, w)
+            y2 = min(rects[k, 3] + 1, h)
+            for i in range(y1, y2):
+                for j in range(x1, x2):
+                    for c in range(channels):
+                        image[i, j, c] = color[c]
+        return image
+
+
+def fill_rects(image: np.ndarray, rects: np.ndarray, color) -> np.ndarray:
+    """
+    Fill axis-aligned rectangles in place - same pixels as cv2.rectangle(..., thickness=-1) per rectangle
+
+    Args:
+        image: C-contiguous uint8 BGR image (h, w, 3), modified in place
+        rects: Array of shape (n, 4) with inclusive corners x1, y1, x2, y2 (clipped to the image)
+        color: BGR color
+
+    Returns:
+        image
+    """
+    rects = np.asarray(rects, dtype=np.int32).reshape(-1, 4)
+    # Either corner order is accepted, as with cv2.rectangle
+    rects = np.ascontiguousarray(np.concatenate((np.minimum(rects[:, :2], rects[:, 2:]),
+                                                 np.maximum(rects[:, :2], rects[:, 2:])), axis=1))
+    color = np.ascontiguousarray(color, dtype=np.uint8)
+    if NUMBA_AVAILABLE and image.flags.c_contiguous:
+        return _fill_rects_numba(image, rects, color)
+    return _fill_rects_numpy(image, rects, color)
+
+
+if NUMBA_AVAILABLE:
+    # Run each kernel once on a 1-row input so nothing is left to do on the first real frame
+    filter_contours(np.zeros((1, 5), dtype=np.float32), 0, 1, 0.0, 1.0)
+    union_find(2, np.array([[0, 1]], dtype=np.int32))
+    group_boxes(np.zeros((1, 4), dtype=np.int32), np.zeros(1, dtype=np.int64), 1)
+    not_blue_mask(np.zeros((1, 1, 3), dtype=np.uint8), np.zeros((1, 1), dtype=np.uint8))
+    disc_stats(np.zeros((1, 1, 3), dtype=np.uint8))
+    disc_stats_batch([np.zeros((1, 1, 3), dtype=np.uint8)])
+    fill_rects(np.zeros((1, 1, 3), dtype=np.uint8), np.zeros((1, 4), dtype=np.int32), (0, 0, 0))
@@ -9,10 +9,13 @@ import logging
 import threading
 import time
 import hashlib
-from typing import Optional, Dict, List, Tuple
+import math
+from typing import Optional, Dict, List, Tuple, Union
 import io
 import os
 
+from camera_kernels import close_pairs, disc_stats, disc_stats_batch, fill_rects, group_boxes, not_blue_mask, union_find
+
 logger = logging.getLogger(__name__)
 
 # Try to import YOLO (optional)
@@ -24,10 +27,83 @@ except ImportError:
     YOLO_AVAILABLE = False
     logger.warning("YOLO not available - install with: pip install ultralytics")
 
+# Try to import simplejpeg (optional, libjpeg-turbo encoder used for the MJPEG stream)
+try:
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+    logger.info("simplejpeg loaded - JPEG frames will be encoded with libjpeg-turbo")
+except ImportError:
+    SIMPLEJPEG_AVAILABLE = False
+    logger.info("simplejpeg not available - using cv2.imencode (install with: pip install simplejpeg)")
+
+# Try to import PyTurboJPEG (optional, keeps one libjpeg-turbo compressor handle for the service)
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420, TJFLAG_FASTDCT
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# Check for a CUDA-enabled OpenCV build (Jetson-class devices; vanilla Pi builds report 0 devices)
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+if CUDA_AVAILABLE:
+    logger.info("OpenCV CUDA device found - image preprocessing will run on the GPU")
+
+# Check for an OpenCL device usable through OpenCV's Transparent API (cv2.UMat)
+try:
+    OPENCL_AVAILABLE = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+except (AttributeError, cv2.error):
+    OPENCL_AVAILABLE = False
+if OPENCL_AVAILABLE:
+    logger.info("OpenCL device found - image preprocessing will use cv2.UMat")
+
+# Draw annotation shapes through OpenCL too (opt-in: CAMERA_UMAT_DRAW=1). Helps desktop GPUs;
+# on the Pi the upload/download costs more than the drawing, so it stays off by default.
+UMAT_DRAW = OPENCL_AVAILABLE and os.getenv('CAMERA_UMAT_DRAW', '0') == '1'
+
+# Try to import Picamera2 (optional, Raspberry Pi camera modules via libcamera)
+try:
+    from picamera2 import Picamera2
+    from picamera2.encoders import MJPEGEncoder
+    from picamera2.outputs import FileOutput
+    PICAMERA2_AVAILABLE = True
+except ImportError:
+    PICAMERA2_AVAILABLE = False
+
+# Internal counter record for the classical detectors (one row per counter); converted to dicts
+# only when the detection result is built. Floats are f8 so the JSON values match the old dicts.
+OBJ_DTYPE = np.dtype([
+    ('x', 'i4'), ('y', 'i4'), ('w', 'i4'), ('h', 'i4'),
+    ('area', 'f8'),
+    ('cx', 'i4'), ('cy', 'i4'),
+    ('radius', 'i4'),
+    ('conf', 'f8'),
+    ('circularity', 'f8'),
+    ('aspect', 'f8')
+])
+
+
+class _LatestJpeg(io.BufferedIOBase):
+    """File-like sink for the Picamera2 MJPEG encoder that keeps only the newest JPEG"""
+
+    def __init__(self):
+        self.frame: Optional[bytes] = None
+        self.condition = threading.Condition()
+
+    def write(self, buf) -> int:
+        with self.condition:
+            self.frame = bytes(buf)
+            self.condition.notify_all()
+        return len(buf)
+
+
 class CameraService:
     """Service for managing USB camera and defect detection"""
     
-    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480):
+    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480,
+                 capture_thread: bool = False, picamera2: bool = False, yuv_capture: bool = False):
         """
         Initialize camera service
         
@@ -35,10 +111,19 @@ class CameraService:
             camera_index: Camera device index (usually 0 for first USB camera)
             width: Frame width
             height: Frame height
+            capture_thread: Read frames on a background thread so callers never wait on the camera
+            picamera2: Capture through Picamera2 instead of cv2.VideoCapture; the stream is then
+                       served from the hardware MJPEG encoder without a decode/re-encode
+            yuv_capture: Read raw YUYV from a cv2.VideoCapture camera; the BGR frame is converted here
+                         and its Y plane is kept as the detectors' grayscale image (no BGR->gray pass)
         """
         self.camera_index = camera_index
         self.width = width
         self.height = height
+        # Let OpenCV's parallel_for_ (morphology, Canny, Hough, ...) use every core and its SIMD paths
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(os.cpu_count() or 1)
+        logger.info(f"OpenCV using {cv2.getNumThreads()} threads, optimized code {'on' if cv2.useOptimized() else 'off'}")
         self.camera: Optional[cv2.VideoCapture] = None
         self.is_streaming = False
         self.lock = threading.Lock()
@@ -65,9 +150,80 @@ class CameraService:
         self.yolo_disabled_until = 0  # Timestamp when YOLO can be re-enabled after crashes
         self.max_crashes = 2  # Disable YOLO after 2 consecutive crashes (more aggressive)
         self.disable_duration = 60  # Disable for 60 seconds after crashes (longer cooldown)
-        
+        # CUDA preprocessing state (GpuMats and filters are reused across frames)
+        self._use_cuda = CUDA_AVAILABLE
+        self._gpu_lock = threading.Lock()
+        self._gpu_frame = None
+        self._gpu_gray = None
+        self._gpu_blurred = None
+        self._gpu_gaussian = None
+        self._gpu_stream = None
+        self._gpu_hsv = None
+        self._gpu_mask = None
+        self._gpu_mask_tmp = None
+        self._gpu_morph: Dict[Tuple[int, int], object] = {}
+        # OpenCL (T-API) preprocessing - used when CUDA is not available
+        self._use_umat = OPENCL_AVAILABLE
+        # Morphology structuring elements, cached by (width, height)
+        self._kernels: Dict[Tuple[int, int], np.ndarray] = {}
+        # HoughCircles radius bounds, cached by (min_area, max_area)
+        self._radius_cache: Dict[Tuple[float, float], Tuple[int, int]] = {}
+        # Rasterized draw_objects labels, cached by text (see _label_sprite)
+        self._label_sprites: Dict[str, Tuple[int, int, np.ndarray, np.ndarray]] = {}
+        # Defect pipeline (defect_detection.DefectDetector), created on the first detect_defects call
+        self._defect_detector = None
+        # Preallocated per-frame working buffers (gray, blurred, defect threshold/edge maps, ...),
+        # reused while the frame size is unchanged. The classical detectors share them, so they run under _detect_lock.
+        self._scratch: Dict[str, np.ndarray] = {}
+        self._detect_lock = threading.Lock()
+        # Last BGR->HSV conversion and the frame it came from (same frame object => reuse)
+        self._hsv_cache_frame: Optional[np.ndarray] = None
+        self._hsv_cache = None
+        # Same for BGR->gray (object and defect detection on one frame convert it once)
+        self._gray_cache_frame: Optional[np.ndarray] = None
+        # Raw YUYV capture (opt-in) - (BGR frame, its Y plane) for the newest frame read
+        self.use_yuv_capture = yuv_capture
+        self._yuyv_size: Optional[Tuple[int, int]] = None
+        self._yuv_gray: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        # Change gate for classical detection - thumbnail of the last processed frame and its result
+        self._prev_small: Optional[np.ndarray] = None
+        self._last_detection_key = None
+        self._last_detection_result: Optional[Dict] = None
+        # Background capture (opt-in) - the capture thread decodes into a ring of reused frame slots;
+        # readers get a copy of the newest slot, so a slot is never handed out and then overwritten
+        self.use_capture_thread = capture_thread
+        self._ring: List[Optional[np.ndarray]] = [None] * 3
+        self._ring_latest = -1  # Slot holding the newest complete frame
+        self._ring_seq = 0  # Frames published by the capture thread
+        self._ring_read_seq = 0  # Sequence number of the last frame returned by read_frame
+        self._ring_cond = threading.Condition()
+        self._yuyv_raw: Optional[np.ndarray] = None  # Capture-thread scratch for raw YUYV frames
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop = threading.Event()
+        # Picamera2 capture (opt-in) - BGR frames from the main stream, JPEGs from the MJPEG encoder
+        if picamera2 and not PICAMERA2_AVAILABLE:
+            logger.warning("Picamera2 not available - using cv2.VideoCapture (install with: sudo apt install python3-picamera2)")
+        self.use_picamera2 = picamera2 and PICAMERA2_AVAILABLE
+        self._picam2 = None
+        self._jpeg_output: Optional[_LatestJpeg] = None
+        # Reused destination for annotated copies (annotate_jpeg), guarded while drawn and encoded
+        self._annotated_buffer: Optional[np.ndarray] = None
+        self._annotate_lock = threading.Lock()
+        # Persistent TurboJPEG compressor (Huffman/quantization state reused across frames)
+        self._tj = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._tj = TurboJPEG()
+                logger.info("TurboJPEG loaded - JPEG frames will use a persistent libjpeg-turbo compressor")
+            except (OSError, RuntimeError) as e:  # Python package present but libturbojpeg missing
+                logger.warning(f"TurboJPEG could not load libturbojpeg: {e}")
+
     def initialize_camera(self) -> bool:
         """Initialize and open camera"""
+        # The capture thread reads from the camera without the lock - stop it before reopening
+        self._stop_capture_thread()
+        if self.use_picamera2:
+            return self._initialize_picamera2()
         try:
             with self.lock:
                 if self.camera is not None:
@@ -92,6 +248,10 @@ class CameraService:
                 except Exception as e:
                     logger.warning(f"Could not set some camera properties: {e}")
 
+                self._yuyv_size = None
+                if self.use_yuv_capture:
+                    self._enable_yuyv()
+
                 # Quick warm up camera (reduced from 5 to 2 frames)
                 # If read() fails, camera may not be ready - that's okay, we'll try again later
                 try:
@@ -106,6 +266,8 @@ class CameraService:
                     # Keep self.camera set so we can try again
                 
                 logger.info(f"Camera initialized at index {self.camera_index} (may need warm-up)")
+                if self.use_capture_thread:
+                    self._start_capture_thread()
                 return True
                 
         except Exception as e:
@@ -119,9 +281,78 @@ class CameraService:
             self.camera = None
             return False
     
+    def _enable_yuyv(self):
+        """Switch the open camera to unconverted YUYV output, or leave it on BGR if the driver refuses"""
+        yuyv = cv2.VideoWriter_fourcc(*'YUYV')
+        try:
+            self.camera.set(cv2.CAP_PROP_FOURCC, yuyv)
+            if int(self.camera.get(cv2.CAP_PROP_FOURCC)) == yuyv and self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 0):
+                self._yuyv_size = (int(self.camera.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                   int(self.camera.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                logger.info(f"Camera delivering raw YUYV {self._yuyv_size[0]}x{self._yuyv_size[1]}")
+                return
+        except Exception as e:
+            logger.warning(f"Could not enable YUYV capture: {e}")
+        self.camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        logger.warning("Camera does not support raw YUYV output - using BGR frames")
+
+    def _from_yuyv(self, raw: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert a raw YUYV capture to a BGR frame and remember its Y plane for _to_gray
+
+        Args:
+            raw: Raw buffer from the camera (h x w x 2, or flat h*w*2 bytes)
+            out: Optional BGR array to convert into (reused when the size matches)
+
+        Returns:
+            BGR frame
+        """
+        width, height = self._yuyv_size
+        yuyv = raw.reshape(height, width, 2)
+        frame = cv2.cvtColor(yuyv, cv2.COLOR_YUV2BGR_YUYV, dst=out)
+        # Luma is every other byte; one strided copy instead of a BGR->gray conversion later
+        self._yuv_gray = (frame, np.ascontiguousarray(yuyv[:, :, 0]))
+        return frame
+
+    def _initialize_picamera2(self) -> bool:
+        """Open the Pi camera with Picamera2 and start the MJPEG encoder on its main stream"""
+        try:
+            with self.lock:
+                self._close_picamera2()
+                picam2 = Picamera2(self.camera_index)
+                # 'RGB888' is stored B, G, R in memory - the same layout as an OpenCV frame
+                config = picam2.create_video_configuration(
+                    main={'size': (self.width, self.height), 'format': 'RGB888'})
+                picam2.configure(config)
+                self._jpeg_output = _LatestJpeg()
+                picam2.start_recording(MJPEGEncoder(), FileOutput(self._jpeg_output))
+                self._picam2 = picam2
+                logger.info(f"Picamera2 initialized at index {self.camera_index} with MJPEG encoder")
+                return True
+        except Exception as e:
+            logger.error(f"Error initializing Picamera2: {e}", exc_info=True)
+            self._picam2 = None
+            self._jpeg_output = None
+            return False
+
+    def _close_picamera2(self):
+        """Stop the encoder and close the Pi camera (caller holds self.lock)"""
+        if self._picam2 is None:
+            return
+        try:
+            self._picam2.stop_recording()
+            self._picam2.close()
+        except Exception:
+            pass  # Ignore errors when releasing
+        self._picam2 = None
+        self._jpeg_output = None
+        logger.info("Picamera2 released")
+
     def release_camera(self):
         """Release camera resources"""
+        self._stop_capture_thread()
         with self.lock:
+            self._close_picamera2()
             if self.camera is not None:
                 self.camera.release()
                 self.camera = None
@@ -133,10 +364,113 @@ class CameraService:
                 self.bg_learning_frames = 0
                 logger.info("Background subtractor reset")
     
+    def _start_capture_thread(self):
+        """Start the background capture loop (camera must already be open)"""
+        self._capture_stop.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, args=(self.camera,),
+                                                name='camera-capture', daemon=True)
+        self._capture_thread.start()
+        logger.info("Camera capture thread started")
+
+    def _stop_capture_thread(self):
+        """Stop the background capture loop and drop the buffered frames"""
+        thread = self._capture_thread
+        if thread is None:
+            return
+        self._capture_stop.set()
+        thread.join(timeout=2.0)
+        self._capture_thread = None
+        with self._ring_cond:
+            self._ring = [None] * len(self._ring)
+            self._ring_latest = -1
+            self._ring_read_seq = self._ring_seq
+        logger.info("Camera capture thread stopped")
+
+    def _capture_loop(self, camera: cv2.VideoCapture):
+        """
+        Capture frames continuously into the frame ring (drop-oldest).
+        This thread is the only reader of the camera while it runs, so no lock is held per frame.
+        Frames are decoded into the slot after the newest one, so steady-state capture allocates nothing.
+        """
+        while not self._capture_stop.is_set():
+            slot = (self._ring_latest + 1) % len(self._ring)
+            try:
+                if not camera.grab():
+                    time.sleep(0.01)
+                    continue
+                if self._yuyv_size is not None:
+                    ret, self._yuyv_raw = camera.retrieve(self._yuyv_raw)
+                    frame = self._from_yuyv(self._yuyv_raw, out=self._ring[slot]) if ret else None
+                else:
+                    ret, frame = camera.retrieve(self._ring[slot])
+            except Exception as e:
+                logger.warning(f"Error reading camera frame: {e}")
+                time.sleep(0.1)
+                continue
+            if not ret or frame is None:
+                continue
+
+            # Publish the slot (retrieve allocates a new array on the first frame or a size change)
+            with self._ring_cond:
+                self._ring[slot] = frame
+                self._ring_latest = slot
+                self._ring_seq += 1
+                self.frame_time = time.time()
+                self._ring_cond.notify_all()
+
+    def _ring_frame(self, wait: bool) -> Optional[np.ndarray]:
+        """
+        Copy the newest frame out of the capture ring
+
+        Args:
+            wait: Wait (up to 1 s) for a frame that read_frame has not returned yet, and mark it returned
+
+        Returns:
+            A copy of the newest frame, or None if there is none (or none arrived in time)
+        """
+        with self._ring_cond:
+            if wait and not self._ring_cond.wait_for(lambda: self._ring_seq > self._ring_read_seq, timeout=1.0):
+                return None
+            if self._ring_latest < 0:
+                return None
+            # The capture thread only writes the slot after the newest, and publishing needs this lock,
+            # so the newest slot can't change while it is copied
+            slot = self._ring[self._ring_latest]
+            frame = slot.copy()
+            if wait:
+                self._ring_read_seq = self._ring_seq
+        yuv_gray = self._yuv_gray
+        if yuv_gray is not None and yuv_gray[0] is slot:
+            self._yuv_gray = (frame, yuv_gray[1])  # The Y plane is a separate array, still valid for the copy
+        self.last_frame = frame
+        return frame
+
     def read_frame(self) -> Optional[np.ndarray]:
         """Read a frame from camera"""
+        if self._picam2 is not None:
+            try:
+                with self.lock:
+                    frame = self._picam2.capture_array('main')
+                self.last_frame = frame
+                self.frame_time = time.time()
+                return frame
+            except Exception as e:
+                logger.warning(f"Error reading Picamera2 frame: {e}")
+                return None
+
+        if self._capture_thread is not None:
+            # Newest frame from the capture thread (waits at most ~one frame interval if just consumed)
+            return self._ring_frame(wait=True)
+
+        requested_at = time.time()
         try:
             with self.lock:
+                # Another caller finished a read while we waited for the lock: share its (newer) frame
+                # rather than queueing a second blocking camera read behind it
+                last_frame = self.last_frame
+                if last_frame is not None and self.frame_time > requested_at:
+                    return last_frame
+                
                 if self.camera is None:
                     return None
                 
@@ -147,6 +481,8 @@ class CameraService:
                 
                 ret, frame = self.camera.read()
                 if ret and frame is not None:
+                    if self._yuyv_size is not None:
+                        frame = self._from_yuyv(frame)
                     self.last_frame = frame
                     self.frame_time = time.time()
                     return frame
@@ -167,14 +503,32 @@ class CameraService:
             
         Returns:
             JPEG bytes or None if frame not available
+            
+        With Picamera2 the newest JPEG from the hardware encoder is returned as-is
+        (quality and the cache arguments don't apply).
         """
+        output = self._jpeg_output
+        if output is not None:
+            with output.condition:
+                if output.frame is None:
+                    output.condition.wait(timeout=1.0)
+                return output.frame
+
         frame = None
         
+        # Capture thread running: the newest buffered frame is at most one frame interval old
+        if self._capture_thread is not None:
+            frame = self._ring_frame(wait=False)
+            if frame is None:
+                frame = self.read_frame()  # Nothing captured yet
+        
         # Use cached frame if available and recent enough (optimization for snapshot mode)
-        if use_cache and self.last_frame is not None:
+        elif use_cache and self.last_frame is not None:
             cache_age = time.time() - self.frame_time
             if cache_age < max_cache_age:
-                frame = self.last_frame.copy()
+                # No copy needed: encoding only reads the frame, and read_frame replaces
+                # last_frame with a new array rather than writing into it
+                frame = self.last_frame
             else:
                 # Cache is too old, read new frame
                 frame = self.read_frame()
@@ -185,7 +539,45 @@ class CameraService:
         if frame is None:
             return None
         
+        return self._encode_jpeg(frame, quality)
+    
+    def annotate_jpeg(self, frame: np.ndarray, objects: List[Dict], quality: int = 85,
+                      color: Tuple[int, int, int] = (0, 255, 0)) -> Optional[bytes]:
+        """
+        Draw detected counters on a copy of frame and return it as JPEG bytes.
+        The copy goes into a buffer reused across calls (no per-frame allocation), and frame is left untouched.
+        
+        Args:
+            frame: Input frame
+            objects: List of detected counter objects (see draw_objects)
+            quality: JPEG quality (0-100)
+            color: Color for annotations (default: green)
+            
+        Returns:
+            JPEG bytes or None if encoding failed
+        """
+        if not objects:
+            return self._encode_jpeg(frame, quality)
+        
+        with self._annotate_lock:
+            annotated = self._annotated_buffer
+            if annotated is None or annotated.shape != frame.shape or annotated.dtype != frame.dtype:
+                annotated = self._annotated_buffer = np.empty_like(frame)
+            np.copyto(annotated, frame)
+            self.draw_objects(annotated, objects, color=color, inplace=True)
+            # Encoded while the lock is held - the buffer is overwritten by the next call
+            return self._encode_jpeg(annotated, quality)
+    
+    def _encode_jpeg(self, frame: np.ndarray, quality: int) -> Optional[bytes]:
+        """Encode a BGR frame as JPEG with the fastest available encoder"""
         try:
+            if self._tj is not None:
+                return self._tj.encode(np.ascontiguousarray(frame), quality=quality, pixel_format=TJPF_BGR,
+                                       jpeg_subsample=TJSAMP_420, flags=TJFLAG_FASTDCT)
+            if SIMPLEJPEG_AVAILABLE:
+                # Encodes straight from BGR with libjpeg-turbo's SIMD paths and returns bytes
+                return simplejpeg.encode_jpeg(np.ascontiguousarray(frame), quality=quality,
+                                              colorspace='BGR', colorsubsampling='420', fastdct=True)
             encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
             ret, buffer = cv2.imencode('.jpg', frame, encode_param)
             if ret:
@@ -227,7 +619,7 @@ class CameraService:
 
         Args:
             frame: Input image frame (BGR format)
-            method: Detection method - 'yolo' (default), 'blob'
+            method: Detection method - 'yolo' (default), 'blob', 'circle'
             params: Optional detection parameters:
                 YOLO:
                 - conf: Confidence threshold (default: 0.25)
@@ -240,6 +632,22 @@ class CameraService:
                 - min_circularity: Minimum circularity (0-1, default: 0.6)
                 - min_convexity: Minimum convexity (0-1, default: 0.7)
                 - min_inertia_ratio: Minimum inertia ratio (0-1, default: 0.3)
+                - blur: Noise prefilter, 'gaussian' (5x5, default) or 'box' (3x3, cheaper)
+
+                Circle (HoughCircles, HSV mask fallback):
+                - min_area / max_area: Counter area range in pixels (default: 500 / 50000)
+                - min_confidence: Minimum confidence (0-1, default: 0.5)
+                - hsv_hue_min / hsv_hue_max: Blue background hue range (default: 90 / 130)
+                - background_mask: 'hsv' (default) or 'bgr' - one-pass BGR test, B ahead of G and R by
+                  blue_margin (default: 20) and above blue_min (default: 80)
+                - detect_scale: Run HoughCircles on a downscaled copy, e.g. 0.5 for counters with
+                  radius >= 40 px; results are scaled back to frame coordinates (default: 1.0)
+                - classify_discs: Label each counter 'white', 'black', 'silver' or 'grey' under
+                  'disc_class', all counters in one batched pass (default: True)
+
+                Blob and Circle:
+                - change_gate: Mean per-pixel change (0-255) on an 80x60 thumbnail below which the
+                  previous result is returned without re-running detection (default: 0 = off)
 
         Returns:
             Dictionary with counter detection results
@@ -260,11 +668,7 @@ class CameraService:
             if method == 'yolo':
                 return self._detect_with_yolo(frame, params)
 
-            # SimpleBlobDetector (fallback)
-            elif method == 'blob':
-                return self._detect_with_blob(frame, params)
-
-            else:
+            if method not in ('blob', 'circle'):
                 return {
                     'objects_found': False,
                     'object_count': 0,
@@ -272,6 +676,35 @@ class CameraService:
                     'error': f'Unknown detection method: {method}'
                 }
 
+            # Classical methods share scratch buffers, so only one runs at a time
+            with self._detect_lock:
+                # Idle belt: if the scene hasn't changed since the last run, reuse that result
+                gate = params.get('change_gate', 0.0)
+                result_key = (method, repr(sorted(params.items())))
+                small = cv2.resize(frame, (80, 60), interpolation=cv2.INTER_AREA) if gate > 0 else None
+                if small is not None:
+                    cached = self._unchanged_result(small, result_key, gate)
+                    if cached is not None:
+                        return cached
+
+                # SimpleBlobDetector (fallback) - only the blurred image is used, so gray conversion
+                # is left to _gray_blur (on the GPU / OpenCL device when there is one)
+                if method == 'blob':
+                    result = self._detect_with_blob(frame, params)
+
+                # HoughCircles with HSV background check
+                else:
+                    result = self._detect_with_circles(frame, params, gray=self._to_gray(frame))
+
+                if 'error' not in result:
+                    # The reference thumbnail only moves when detection actually runs, so slow drift
+                    # accumulates against it instead of hiding frame to frame. The cached result is
+                    # a copy - callers add keys (annotated_image) to the dict they get back
+                    self._prev_small = small
+                    self._last_detection_key = result_key
+                    self._last_detection_result = {**result, 'objects': [dict(obj) for obj in result['objects']]}
+                return result
+
         except Exception as e:
             logger.error(f"Error in object detection: {e}")
             return {
@@ -304,7 +737,7 @@ class CameraService:
             }
 
         # Calculate frame hash to detect if frame changed
-        frame_hash = hashlib.md5(frame.tobytes()).hexdigest()
+        frame_hash = hashlib.md5(np.ascontiguousarray(frame)).hexdigest()  # Hashes the pixel buffer in place, no copy
         
         # Rate limiting and caching: return cached result if called too soon or same frame
         current_time = time.time()
@@ -508,21 +941,19 @@ class CameraService:
                 # Ensure lock is released even if there's an error
                 pass
 
-    def _detect_with_blob(self, frame: np.ndarray, params: Dict) -> Dict:
-        """Detect objects using SimpleBlobDetector"""
+    def _detect_with_blob(self, frame: np.ndarray, params: Dict, gray: Optional[np.ndarray] = None) -> Dict:
+        """Detect objects using SimpleBlobDetector (gray: optional precomputed grayscale of frame)"""
         # Extract parameters
         min_area = params.get('min_area', 500)
         max_area = params.get('max_area', 50000)
         min_circularity = params.get('min_circularity', 0.6)
         min_convexity = params.get('min_convexity', 0.7)
         min_inertia_ratio = params.get('min_inertia_ratio', 0.3)
+        box_blur = params.get('blur', 'gaussian') == 'box'
 
         try:
-            # Step 1: Convert to grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-            # Step 2: Apply Gaussian blur to reduce noise and reflections
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+            # Step 1 & 2: Convert to grayscale and blur to reduce noise and reflections
+            blurred = self._gray_blur(frame, gray=gray, box=box_blur)
 
             # Step 3: Setup SimpleBlobDetector parameters (very relaxed)
             blob_params = cv2.SimpleBlobDetector_Params()
@@ -558,36 +989,22 @@ class CameraService:
 
             logger.info(f"SimpleBlobDetector found {len(keypoints)} keypoints")
 
-            objects = []
-
-            # Step 5: Extract blob information
-            for kp in keypoints:
-                x, y = kp.pt
-                size = kp.size
-                radius = size / 2
-                area = np.pi * radius * radius
-
-                logger.debug(f"Blob at ({x:.0f},{y:.0f}), size={size:.0f}, area={area:.0f}")
-
-                # Calculate bounding box
-                x_int = int(x - radius)
-                y_int = int(y - radius)
-                w = h = int(size)
-
-                objects.append({
-                    'type': 'counter',
-                    'x': x_int,
-                    'y': y_int,
-                    'width': w,
-                    'height': h,
-                    'area': float(area),
-                    'center': (int(x), int(y)),
-                    'radius': int(radius),
-                    'circularity': 1.0,  # SimpleBlobDetector filters by circularity already
-                    'confidence': 0.9,  # High confidence for blob detection
-                    'method': 'blob'
-                })
+            objects = np.empty(0, dtype=OBJ_DTYPE)
+
+            # Step 5: Extract blob information column-wise into an OBJ_DTYPE array
+            if keypoints:
+                pts = cv2.KeyPoint_convert(keypoints).reshape(-1, 2)
+                sizes = np.fromiter((kp.size for kp in keypoints), dtype=np.float32, count=len(keypoints))
+                radii = sizes / 2
+                sides = sizes.astype(np.int32)
 
+                # Bounding boxes (int() truncates toward zero, so use trunc rather than floor);
+                # SimpleBlobDetector filters by circularity already, high confidence for blob detection
+                objects = self._make_objects(np.trunc(pts[:, 0] - radii), np.trunc(pts[:, 1] - radii), sides, sides,
+                                             math.pi * radii * radii, pts[:, 0], pts[:, 1], radii, 0.9)
+                logger.debug(f"Blobs: {objects[['cx', 'cy', 'w', 'area']].tolist()}")
+
+            objects = self._objects_to_dicts(objects, 'counter', 'blob')
             logger.info(f"Returning {len(objects)} detected counters")
 
             return {
@@ -607,61 +1024,278 @@ class CameraService:
                 'error': str(e)
             }
     
+    def _unchanged_result(self, small: np.ndarray, key, gate: float) -> Optional[Dict]:
+        """
+        Cheap change detector run before the full pipeline.
+        Compares an 80x60 thumbnail of the frame with the one from the last full detection run and,
+        if the mean absolute difference is below gate and that run used the same method/params,
+        returns a copy of its result. Otherwise returns None.
+        """
+        prev = self._prev_small
+        if (gate <= 0 or prev is None or prev.shape != small.shape
+                or key != self._last_detection_key or self._last_detection_result is None):
+            return None
+
+        if cv2.norm(small, prev, cv2.NORM_L1) / small.size >= gate:
+            return None
+
+        # Callers annotate the returned objects (counter numbers etc.), so hand out copies
+        result = self._last_detection_result
+        return {
+            **result,
+            'objects': [dict(obj) for obj in result['objects']],
+            'timestamp': time.time(),
+            'unchanged': True
+        }
+
+    def _detect_with_circles(self, frame: np.ndarray, params: Dict, gray: Optional[np.ndarray] = None) -> Dict:
+        """
+        Detect counters with HoughCircles, rejecting circles centred on the blue belt.
+        Falls back to HSV mask + contour analysis only when Hough finds nothing.
+        """
+        min_area = params.get('min_area', 500)
+        max_area = params.get('max_area', 50000)
+        min_confidence = params.get('min_confidence', 0.5)
+
+        try:
+            objects = self._detect_circles_hough(frame, params, min_area, max_area, min_confidence, gray=gray)
+            if len(objects):
+                objects = objects[~self._on_blue_background(frame, np.stack((objects['cx'], objects['cy']), axis=1),
+                                                            params)]
+
+            if not len(objects):
+                logger.info("No circles from HoughCircles - trying HSV fallback")
+                objects = self._detect_circles_hsv_fallback(frame, params, min_area, max_area, min_confidence)
+            objects = self._objects_to_dicts(objects, 'circle', 'circle', aspect_ratio=True)
+
+            if objects and params.get('classify_discs', True):
+                # Collect every counter's ROI first, then classify them together. The square inscribed
+                # in the disc (half-side r/sqrt(2)) keeps belt pixels out of the colour statistics.
+                frame_shape = frame.shape[:2]
+                rois = [self._extract_circle_roi(frame, obj['center'][0], obj['center'][1],
+                                                 int(obj['radius'] * 0.7), frame_shape)
+                        for obj in objects]
+                for obj, label in zip(objects, self.classify_discs(rois)):
+                    obj['disc_class'] = label
+
+            logger.info(f"Returning {len(objects)} detected counters")
+
+            return {
+                'objects_found': len(objects) > 0,
+                'object_count': len(objects),
+                'objects': objects,
+                'method': 'circle',
+                'timestamp': time.time()
+            }
+
+        except Exception as e:
+            logger.error(f"Error in circle detection: {e}")
+            return {
+                'objects_found': False,
+                'object_count': 0,
+                'objects': [],
+                'error': str(e)
+            }
+
+    def _on_blue_background(self, frame: np.ndarray, centers: List[Tuple[int, int]], params: Dict) -> np.ndarray:
+        """
+        Check which points lie on the blue background.
+        Only the sampled pixels are converted to HSV, not the whole frame.
+
+        Returns:
+            Boolean array, True where the point is background
+        """
+        h, w = frame.shape[:2]
+        pts = np.array(centers, dtype=np.int32).reshape(-1, 2)
+        xs = np.clip(pts[:, 0], 0, w - 1)
+        ys = np.clip(pts[:, 1], 0, h - 1)
+        hsv = cv2.cvtColor(np.ascontiguousarray(frame[ys, xs].reshape(-1, 1, 3)), cv2.COLOR_BGR2HSV).reshape(-1, 3)
+        hue_min = params.get('hsv_hue_min', 90)
+        hue_max = params.get('hsv_hue_max', 130)
+        return ((hsv[:, 0] >= hue_min) & (hsv[:, 0] <= hue_max)
+                & (hsv[:, 1] >= 50) & (hsv[:, 2] >= 50))
+
+    def _kernel(self, width: int, height: Optional[int] = None) -> np.ndarray:
+        """Get a cached rectangular structuring element (square when height is omitted)"""
+        key = (width, width if height is None else height)
+        kernel = self._kernels.get(key)
+        if kernel is None:
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, key)
+            self._kernels[key] = kernel
+        return kernel
+
+    def _morph_separable(self, mask: np.ndarray, op: int, size: int) -> np.ndarray:
+        """
+        Close or open a binary mask in place with a size x size rectangle, applied as a
+        (size, 1) pass followed by a (1, size) pass - O(size) instead of O(size^2) per pixel.
+
+        Args:
+            mask: Binary mask (modified in place)
+            op: cv2.MORPH_CLOSE or cv2.MORPH_OPEN
+            size: Rectangle side length
+
+        Returns:
+            The same mask array
+        """
+        row = self._kernel(size, 1)
+        col = self._kernel(1, size)
+        steps = (cv2.dilate, cv2.erode) if op == cv2.MORPH_CLOSE else (cv2.erode, cv2.dilate)
+        for step in steps:
+            step(mask, row, dst=mask)
+            step(mask, col, dst=mask)
+        return mask
+
+    def _scratch_buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Get a named preallocated buffer, reallocating only when the shape or dtype changes"""
+        buf = self._scratch.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._scratch[name] = buf
+        return buf
+
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert a BGR frame to grayscale into the shared 'gray' scratch buffer,
+        reusing the buffer as-is when called again with the same frame
+        """
+        yuv_gray = self._yuv_gray
+        if yuv_gray is not None and yuv_gray[0] is frame:
+            return yuv_gray[1]  # Frame came from the YUYV capture - its Y plane is the grayscale image
+        gray = self._scratch_buffer('gray', frame.shape[:2])
+        if frame is self._gray_cache_frame:
+            return gray
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        # Keep a reference to the frame itself (not its id) so the key can't be recycled
+        self._gray_cache_frame = frame
+        return gray
+
+    def _to_hsv(self, frame: np.ndarray):
+        """
+        Convert a BGR frame to HSV, reusing the previous result when called again with the same frame.
+        The result is a cv2.UMat when OpenCL is in use, otherwise the shared 'hsv' scratch buffer.
+        """
+        if frame is self._hsv_cache_frame:
+            return self._hsv_cache
+
+        if self._use_umat:
+            hsv = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2HSV)
+        else:
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._scratch_buffer('hsv', frame.shape))
+        # Keep a reference to the frame itself (not its id) so the key can't be recycled
+        self._hsv_cache_frame = frame
+        self._hsv_cache = hsv
+        return hsv
+
+    def _gray_blur(self, frame: np.ndarray, gray: Optional[np.ndarray] = None, box: bool = False) -> np.ndarray:
+        """
+        Convert a BGR frame to grayscale and apply a 5x5 Gaussian blur.
+        Runs on the GPU when a CUDA device is available, through OpenCL (cv2.UMat)
+        when an OpenCL device is available, otherwise on the CPU.
+        If gray is given it is used instead of converting the frame again.
+        With box=True a 3x3 box filter is used instead - cheap enough that it always runs on the CPU.
+        """
+        yuv_gray = self._yuv_gray
+        if gray is None and yuv_gray is not None and yuv_gray[0] is frame:
+            gray = yuv_gray[1]
+        if box:
+            if gray is None:
+                gray = self._to_gray(frame)
+            blurred = self._scratch_buffer('blurred', gray.shape)
+            return cv2.boxFilter(gray, -1, (3, 3), dst=blurred, normalize=True)
+
+        if self._use_cuda:
+            try:
+                with self._gpu_lock:
+                    return self._gray_blur_cuda(frame, gray)
+            except (cv2.error, AttributeError) as e:  # AttributeError: CUDA build without that module
+                logger.warning(f"CUDA preprocessing failed, falling back to CPU: {e}")
+                self._use_cuda = False
+
+        if self._use_umat:
+            if gray is None:
+                gray_umat = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            else:
+                gray_umat = cv2.UMat(gray)
+            return cv2.GaussianBlur(gray_umat, (5, 5), 0).get()
+
+        if gray is None:
+            gray = self._to_gray(frame)
+        blurred = self._scratch_buffer('blurred', gray.shape)
+        return cv2.GaussianBlur(gray, (5, 5), 0, dst=blurred)
+
+    def _gray_blur_cuda(self, frame: np.ndarray, gray: Optional[np.ndarray] = None) -> np.ndarray:
+        """GPU version of _gray_blur - only the single-channel result is downloaded"""
+        if self._gpu_frame is None:
+            self._gpu_frame = cv2.cuda_GpuMat()
+            self._gpu_gray = cv2.cuda_GpuMat()
+            self._gpu_blurred = cv2.cuda_GpuMat()
+            self._gpu_gaussian = cv2.cuda.createGaussianFilter(cv2.CV_8UC1, cv2.CV_8UC1, (5, 5), 0)
+
+        if gray is None:
+            self._gpu_frame.upload(frame)
+            cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2GRAY, dst=self._gpu_gray)
+        else:
+            # Already converted on the CPU - upload the single channel (1/3 of the bytes)
+            self._gpu_gray.upload(gray)
+        self._gpu_gaussian.apply(self._gpu_gray, dst=self._gpu_blurred)
+        return self._gpu_blurred.download()
+
     def _merge_nearby_objects(self, objects: List[Dict], threshold: int = 30) -> List[Dict]:
-        """Merge objects that are close to each other"""
-        if len(objects) == 0:
-            return []
+        """
+        Merge objects that are close to each other.
+        Objects whose centers are closer than threshold pixels are grouped transitively
+        (connected components of the neighbour graph) and merged into one box.
+        """
+        n = len(objects)
+        if n <= 1:
+            return list(objects)
         
-        merged = []
-        used = set()
+        # Neighbour pairs (same strict rule as the defect merge)
+        centers = np.array([o['center'] for o in objects], dtype=np.int32)
+        
+        # Connected components of the neighbour graph
+        labels = union_find(n, close_pairs(centers, threshold))
+        _, group_ids, group_sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        num_groups = len(group_sizes)
         
-        for i, obj in enumerate(objects):
-            if i in used:
+        # Group-reduce bounding boxes, areas and confidences
+        boxes = np.array([(o['x'], o['y'], o['x'] + o['width'], o['y'] + o['height']) for o in objects])
+        gx1, gy1, gx2, gy2 = group_boxes(boxes, group_ids, num_groups).T
+        garea = np.zeros(num_groups)
+        np.add.at(garea, group_ids, [o['area'] for o in objects])
+        gconf = np.full(num_groups, -np.inf)
+        np.maximum.at(gconf, group_ids, [o['confidence'] for o in objects])
+        
+        # Emit groups in order of their first member (singletons pass through unchanged)
+        merged = []
+        first_member = np.full(num_groups, -1)
+        for i in range(n):
+            g = group_ids[i]
+            if first_member[g] >= 0:
+                continue
+            first_member[g] = i
+            if group_sizes[g] == 1:
+                merged.append(objects[i])
                 continue
             
-            center = obj['center']
-            group = [obj]
-            used.add(i)
-            
-            for j, other_obj in enumerate(objects):
-                if j in used or j == i:
-                    continue
-                
-                other_center = other_obj['center']
-                dist = np.sqrt((center[0] - other_center[0])**2 + (center[1] - other_center[1])**2)
-                
-                if dist < threshold:
-                    group.append(other_obj)
-                    used.add(j)
-            
-            # Merge group into single object
-            if len(group) > 1:
-                xs = [o['x'] for o in group]
-                ys = [o['y'] for o in group]
-                ws = [o['width'] for o in group]
-                hs = [o['height'] for o in group]
-                
-                x, y = min(xs), min(ys)
-                w = max(x + w for x, w in zip(xs, ws)) - x
-                h = max(y + h for y, h in zip(ys, hs)) - y
-                
-                merged.append({
-                    'type': 'object',
-                    'x': x,
-                    'y': y,
-                    'width': w,
-                    'height': h,
-                    'area': sum(o['area'] for o in group),
-                    'center': (x + w//2, y + h//2),
-                    'confidence': max(o['confidence'] for o in group),
-                    'method': 'merged'
-                })
-            else:
-                merged.append(obj)
+            x, y = int(gx1[g]), int(gy1[g])
+            w, h = int(gx2[g]) - x, int(gy2[g]) - y
+            merged.append({
+                'type': 'object',
+                'x': x,
+                'y': y,
+                'width': w,
+                'height': h,
+                'area': float(garea[g]),
+                'center': (x + w//2, y + h//2),
+                'confidence': float(gconf[g]),
+                'method': 'merged'
+            })
         
         return merged
     
-    def _extract_circle_roi(self, frame: np.ndarray, x: int, y: int, radius: int) -> Optional[np.ndarray]:
+    def _extract_circle_roi(self, frame: np.ndarray, x: int, y: int, radius: int,
+                            frame_shape: Optional[Tuple[int, int]] = None) -> Optional[np.ndarray]:
         """
         Extract region of interest around a circle for classification
         
@@ -670,47 +1304,71 @@ class CameraService:
             x: Circle center X coordinate
             y: Circle center Y coordinate
             radius: Circle radius
+            frame_shape: Optional (height, width) of frame, read once by callers that loop over circles
             
         Returns:
             ROI image or None if extraction fails
         """
+        frame_h, frame_w = frame_shape if frame_shape is not None else frame.shape[:2]
         y1 = max(0, y - radius)
-        y2 = min(frame.shape[0], y + radius)
+        y2 = min(frame_h, y + radius)
         x1 = max(0, x - radius)
-        x2 = min(frame.shape[1], x + radius)
+        x2 = min(frame_w, x + radius)
         
         roi = frame[y1:y2, x1:x2]
         return roi if roi.size > 0 else None
     
-    def _create_circle_object(self, x: int, y: int, radius: int, area: float, 
-                             confidence: float) -> Dict:
+    def _make_objects(self, x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray, area: np.ndarray,
+                      cx: np.ndarray, cy: np.ndarray, radius: np.ndarray, confidence,
+                      circularity=1.0, aspect_ratio=1.0) -> np.ndarray:
+        """Build an OBJ_DTYPE array from per-counter columns (float coordinates are truncated)"""
+        objects = np.zeros(len(x), dtype=OBJ_DTYPE)
+        objects['x'] = x
+        objects['y'] = y
+        objects['w'] = w
+        objects['h'] = h
+        objects['area'] = area
+        objects['cx'] = cx
+        objects['cy'] = cy
+        objects['radius'] = radius
+        objects['conf'] = confidence
+        objects['circularity'] = circularity
+        objects['aspect'] = aspect_ratio
+        return objects
+    
+    def _objects_to_dicts(self, objects: np.ndarray, object_type: str, method: str,
+                          aspect_ratio: bool = False) -> List[Dict]:
         """
-        Create a standardized circle object dictionary
+        Convert an OBJ_DTYPE array to the counter dicts returned by detect_objects
         
         Args:
-            x: Circle center X coordinate
-            y: Circle center Y coordinate
-            radius: Circle radius
-            area: Circle area
-            confidence: Detection confidence (0-1)
+            objects: OBJ_DTYPE array
+            object_type: Value of each dict's 'type'
+            method: Value of each dict's 'method'
+            aspect_ratio: Include the 'aspect_ratio' key
             
         Returns:
-            Object dictionary
+            List of object dictionaries (confidence, circularity and aspect ratio rounded to 2 places)
         """
-        return {
-            'type': 'circle',
-            'x': int(x - radius),
-            'y': int(y - radius),
-            'width': int(2 * radius),
-            'height': int(2 * radius),
-            'area': float(area),
-            'center': (int(x), int(y)),
-            'radius': int(radius),
-            'circularity': 1.0,
-            'confidence': round(confidence, 2),
-            'method': 'circle',
-            'aspect_ratio': 1.0
-        }
+        result = []
+        for x, y, w, h, area, cx, cy, radius, confidence, circularity, aspect in objects.tolist():
+            obj = {
+                'type': object_type,
+                'x': x,
+                'y': y,
+                'width': w,
+                'height': h,
+                'area': area,
+                'center': (cx, cy),
+                'radius': radius,
+                'circularity': round(circularity, 2),
+                'confidence': round(confidence, 2),
+                'method': method
+            }
+            if aspect_ratio:
+                obj['aspect_ratio'] = round(aspect, 2)
+            result.append(obj)
+        return result
     
     def classify_disc(self, roi: np.ndarray) -> str:
         """
@@ -727,33 +1385,51 @@ class CameraService:
             return 'unknown'
         
         try:
-            # Convert to HSV for color analysis
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-            
-            # Calculate mean HSV values
-            mean_hsv = hsv.mean(axis=(0, 1))  # H, S, V mean values
-            H, S, V = mean_hsv
-            
-            # Calculate variance in BGR space for silver vs grey detection
-            grey_var = np.var(roi)
-            
-            # Classification logic based on brightness, saturation, and variance
-            if V > 180 and S < 40:
-                return 'white'
-            elif V < 60:
-                return 'black'
-            elif grey_var > 200:
-                return 'silver'
-            else:
-                return 'grey'
+            # Mean HSV values plus BGR variance (for silver vs grey) in one pass over the ROI
+            return self._disc_label(*disc_stats(roi))
                 
         except Exception as e:
             logger.error(f"Error classifying disc: {e}")
             return 'unknown'
     
+    def classify_discs(self, rois: List[Optional[np.ndarray]]) -> List[str]:
+        """
+        Classify several discs from one frame in a single batched pass (see classify_disc)
+        
+        Args:
+            rois: Disc ROIs in BGR format; None or empty entries are classified 'unknown'
+            
+        Returns:
+            Classification strings in the same order as rois
+        """
+        labels = ['unknown'] * len(rois)
+        valid = [i for i, roi in enumerate(rois) if roi is not None and roi.size > 0]
+        if len(valid) == 1:
+            labels[valid[0]] = self.classify_disc(rois[valid[0]])
+        elif valid:
+            try:
+                stats = disc_stats_batch([rois[i] for i in valid])
+                for i, (H, S, V, grey_var) in zip(valid, stats.tolist()):
+                    labels[i] = self._disc_label(H, S, V, grey_var)
+            except Exception as e:
+                logger.error(f"Error classifying discs: {e}")
+        return labels
+    
+    @staticmethod
+    def _disc_label(H: float, S: float, V: float, grey_var: float) -> str:
+        """Classification logic based on brightness, saturation, and variance"""
+        if V > 180 and S < 40:
+            return 'white'
+        elif V < 60:
+            return 'black'
+        elif grey_var > 200:
+            return 'silver'
+        else:
+            return 'grey'
+    
     def _detect_circles_hough(self, frame: np.ndarray, params: Dict, 
                               min_object_area: int, max_object_area: int, 
-                              min_confidence: float) -> List[Dict]:
+                              min_confidence: float, gray: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Detect circles using HoughCircles on grayscale image
         
@@ -763,83 +1439,182 @@ class CameraService:
             min_object_area: Minimum object area
             max_object_area: Maximum object area
             min_confidence: Minimum confidence threshold
+            gray: Optional precomputed grayscale of frame (shared with other detectors)
             
         Returns:
-            List of detected circle objects
+            Detected circles (OBJ_DTYPE array)
         """
-        objects = []
+        objects = np.empty(0, dtype=OBJ_DTYPE)
         
-        # Convert to grayscale for circle detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # Convert to grayscale for circle detection (unless the caller already did)
+        if gray is None:
+            gray = self._to_gray(frame)
+        
+        # Optionally run the blur and accumulator on a downscaled copy (0.5 = a quarter of the pixels)
+        scale = float(params.get('detect_scale', 1.0))
+        if 0 < scale < 1:
+            h, w = gray.shape[:2]
+            small_size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            gray = cv2.resize(gray, small_size, dst=self._scratch_buffer('hough_small', small_size[::-1]),
+                              interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
         
         # Apply Gaussian blur to reduce noise (larger kernel for better smoothing)
-        blurred = cv2.GaussianBlur(gray, (11, 11), 2)
+        ksize = max(3, int(round(11 * scale)) | 1)
+        if self._use_umat:
+            # Blur through OpenCL; HoughCircles takes the UMat directly, so it is never downloaded
+            blurred = cv2.GaussianBlur(cv2.UMat(gray), (ksize, ksize), 2 * scale)
+        else:
+            blurred = cv2.GaussianBlur(gray, (ksize, ksize), 2 * scale,
+                                       dst=self._scratch_buffer('hough_blurred', gray.shape))
         
         # HoughCircles parameters - optimized for ultra-reliable circle detection
         dp = 1  # Inverse ratio of accumulator resolution
         min_dist = params.get('min_dist_between_circles', 50)
         param1 = 100  # Upper threshold for edge detection (higher = better edge detection)
         param2 = params.get('hough_circle_threshold', 30)  # Higher = fewer false positives, more reliable
-        min_radius = max(5, int(np.sqrt(min_object_area / np.pi)))  # Ensure minimum radius is at least 5 pixels
-        max_radius = int(np.sqrt(max_object_area / np.pi))
+        min_radius, max_radius = self._radius_range(min_object_area, max_object_area)
         
         logger.info(f"Circle detection params: min_area={min_object_area}, max_area={max_object_area}, "
-                   f"min_radius={min_radius}, max_radius={max_radius}, param2={param2}")
+                   f"min_radius={min_radius}, max_radius={max_radius}, param2={param2}, scale={scale}")
         
-        # Detect circles using HoughCircles
+        # Detect circles using HoughCircles (radii and spacing in the detection image's pixels)
         circles = cv2.HoughCircles(
             blurred,
             cv2.HOUGH_GRADIENT,
             dp=dp,
-            minDist=min_dist,
+            minDist=max(1, min_dist * scale),
             param1=param1,
             param2=param2,
-            minRadius=min_radius,
-            maxRadius=max_radius
+            minRadius=max(2, int(min_radius * scale)),
+            maxRadius=max(3, int(round(max_radius * scale)))
         )
         
+        if isinstance(circles, cv2.UMat):
+            circles = circles.get()  # None when no circles were found
+        
         if circles is not None:
-            circles = np.round(circles[0, :]).astype("int")
+            # Back to full-resolution coordinates
+            circles = np.round(circles[0, :] / scale).astype("int")
             logger.info(f"HoughCircles found {len(circles)} potential circles")
             
-            for (x, y, r) in circles:
-                # Calculate area
-                area = np.pi * r * r
-                
-                logger.debug(f"Circle candidate: center=({x},{y}), radius={r}, area={area:.0f}")
-                
-                # Basic area filtering: Only accept circles within the size range
-                if area < min_object_area:
-                    logger.debug(f"  Rejected: area {area:.0f} < min {min_object_area}")
-                    continue
-                if area > max_object_area:
-                    logger.debug(f"  Rejected: area {area:.0f} > max {max_object_area}")
-                    continue
-                
-                # Simple confidence calculation based on size
-                # Normalize area to 0-1 range within min/max bounds
-                if max_object_area > min_object_area:
-                    normalized_area = (area - min_object_area) / (max_object_area - min_object_area)
-                    # Higher confidence for circles in the middle range
-                    confidence = 0.5 + (normalized_area * 0.5)  # Range: 0.5 to 1.0
-                else:
-                    confidence = 0.7  # Default confidence
-                
-                # Only add if meets confidence threshold
-                if confidence >= min_confidence:
-                    logger.info(f"  Accepted circle: center=({x},{y}), radius={r}, area={area:.0f}, confidence={confidence:.2f}")
-                    obj = self._create_circle_object(x, y, r, area, confidence)
-                    objects.append(obj)
-                else:
-                    logger.debug(f"  Rejected: confidence {confidence:.2f} < min {min_confidence}")
+            # Area and size-based confidence for every candidate at once
+            radii = circles[:, 2]
+            areas = math.pi * radii * radii
+            if max_object_area > min_object_area:
+                # Normalize area to 0-1 within min/max bounds; range 0.5 to 1.0
+                confidences = 0.5 + (areas - min_object_area) / (max_object_area - min_object_area) * 0.5
+            else:
+                confidences = np.full(len(circles), 0.7)  # Default confidence
+            
+            # Only candidates inside the size range and above the confidence threshold get an object
+            keep = (areas >= min_object_area) & (areas <= max_object_area) & (confidences >= min_confidence)
+            logger.debug(f"Rejected {len(circles) - int(keep.sum())} circles by area/confidence")
+            
+            x, y, r = circles[keep].T
+            objects = self._make_objects(x - r, y - r, 2 * r, 2 * r, areas[keep], x, y, r, confidences[keep])
+            for cx, cy, r, area, confidence in objects[['cx', 'cy', 'radius', 'area', 'conf']].tolist():
+                logger.info(f"  Accepted circle: center=({cx},{cy}), radius={r}, area={area:.0f}, confidence={confidence:.2f}")
         
         logger.info(f"Total circles detected after filtering: {len(objects)}")
         
         return objects
     
+    def _radius_range(self, min_object_area: float, max_object_area: float) -> Tuple[int, int]:
+        """Circle radius bounds for an area range, cached per (min_area, max_area)"""
+        key = (min_object_area, max_object_area)
+        radii = self._radius_cache.get(key)
+        if radii is None:
+            min_radius = max(5, int(math.sqrt(min_object_area / math.pi)))  # Ensure minimum radius is at least 5 pixels
+            max_radius = int(math.sqrt(max_object_area / math.pi))
+            radii = self._radius_cache[key] = (min_radius, max_radius)
+        return radii
+
+    def _object_mask(self, frame: np.ndarray, params: Dict) -> np.ndarray:
+        """
+        Build the cleaned-up "not blue background" mask used by the HSV fallback.
+        On CUDA hosts the whole stage (HSV, range test, inversion, close/open) runs on the GPU
+        and only the single-channel mask is downloaded.
+        """
+        hsv_hue_min = params.get('hsv_hue_min', 90)
+        hsv_hue_max = params.get('hsv_hue_max', 130)
+        lower_blue = (hsv_hue_min, 50, 50)
+        upper_blue = (hsv_hue_max, 255, 255)
+        kernel_size = params.get('morphological_kernel_size', 7)
+        
+        if params.get('background_mask', 'hsv') == 'bgr':
+            # Single fused pass from BGR - no HSV image is materialized
+            object_mask = not_blue_mask(np.ascontiguousarray(frame), self._scratch_buffer('object_mask', frame.shape[:2]),
+                                        params.get('blue_margin', 20), params.get('blue_min', 80))
+            kernel = self._kernel(kernel_size)
+            cv2.morphologyEx(object_mask, cv2.MORPH_CLOSE, kernel, dst=object_mask)
+            cv2.morphologyEx(object_mask, cv2.MORPH_OPEN, kernel, dst=object_mask)
+            return object_mask
+        
+        if self._use_cuda:
+            try:
+                with self._gpu_lock:
+                    return self._object_mask_cuda(frame, lower_blue, upper_blue, kernel_size)
+            except (cv2.error, AttributeError) as e:  # AttributeError: CUDA build without that module
+                logger.warning(f"CUDA mask stage failed, falling back to CPU: {e}")
+                self._use_cuda = False
+        
+        # Convert to HSV for color-based detection (cached per frame)
+        hsv = self._to_hsv(frame)
+        
+        # Objects are everything that is not blue: invert the range mask in place in one scratch buffer
+        lower = np.array(lower_blue)
+        upper = np.array(upper_blue)
+        if isinstance(hsv, cv2.UMat):
+            object_mask = cv2.inRange(hsv, lower, upper)
+        else:
+            object_mask = cv2.inRange(hsv, lower, upper, dst=self._scratch_buffer('object_mask', frame.shape[:2]))
+        cv2.bitwise_not(object_mask, dst=object_mask)
+        
+        # Clean up mask (in place - object_mask is a temporary we own)
+        kernel = self._kernel(kernel_size)
+        cv2.morphologyEx(object_mask, cv2.MORPH_CLOSE, kernel, dst=object_mask)
+        cv2.morphologyEx(object_mask, cv2.MORPH_OPEN, kernel, dst=object_mask)
+        if isinstance(object_mask, cv2.UMat):
+            object_mask = object_mask.get()  # Component labelling runs on the CPU
+        return object_mask
+    
+    def _object_mask_cuda(self, frame: np.ndarray, lower_blue: Tuple[int, int, int],
+                          upper_blue: Tuple[int, int, int], kernel_size: int) -> np.ndarray:
+        """GPU version of _object_mask - queued on one persistent stream, filters built once per kernel size"""
+        if self._gpu_stream is None:
+            self._gpu_stream = cv2.cuda_Stream()
+            self._gpu_hsv = cv2.cuda_GpuMat()
+            self._gpu_mask = cv2.cuda_GpuMat()
+            self._gpu_mask_tmp = cv2.cuda_GpuMat()
+        if self._gpu_frame is None:
+            self._gpu_frame = cv2.cuda_GpuMat()
+        
+        close_filter = self._gpu_morph.get((cv2.MORPH_CLOSE, kernel_size))
+        if close_filter is None:
+            kernel = self._kernel(kernel_size)
+            close_filter = cv2.cuda.createMorphologyFilter(cv2.MORPH_CLOSE, cv2.CV_8UC1, kernel)
+            self._gpu_morph[(cv2.MORPH_CLOSE, kernel_size)] = close_filter
+            self._gpu_morph[(cv2.MORPH_OPEN, kernel_size)] = cv2.cuda.createMorphologyFilter(
+                cv2.MORPH_OPEN, cv2.CV_8UC1, kernel)
+        open_filter = self._gpu_morph[(cv2.MORPH_OPEN, kernel_size)]
+        
+        stream = self._gpu_stream
+        self._gpu_frame.upload(frame, stream)
+        cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2HSV, dst=self._gpu_hsv, stream=stream)
+        cv2.cuda.inRange(self._gpu_hsv, lower_blue, upper_blue, dst=self._gpu_mask_tmp, stream=stream)
+        cv2.cuda.bitwise_not(self._gpu_mask_tmp, dst=self._gpu_mask, stream=stream)
+        close_filter.apply(self._gpu_mask, self._gpu_mask_tmp, stream)
+        open_filter.apply(self._gpu_mask_tmp, self._gpu_mask, stream)
+        
+        object_mask = self._gpu_mask.download(stream, self._scratch_buffer('object_mask', frame.shape[:2]))
+        stream.waitForCompletion()
+        return object_mask
+    
     def _detect_circles_hsv_fallback(self, frame: np.ndarray, params: Dict,
                                      min_object_area: int, max_object_area: int,
-                                     min_confidence: float) -> List[Dict]:
+                                     min_confidence: float) -> np.ndarray:
         """
         Fallback circle detection using HSV color masking (for when HoughCircles fails)
         
@@ -851,153 +1626,211 @@ class CameraService:
             min_confidence: Minimum confidence threshold
             
         Returns:
-            List of detected circle objects
+            Detected circles (OBJ_DTYPE array)
         """
-        objects = []
+        objects = np.empty(0, dtype=OBJ_DTYPE)
         
-        # Convert to HSV for color-based detection
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        hsv_hue_min = params.get('hsv_hue_min', 90)
-        hsv_hue_max = params.get('hsv_hue_max', 130)
+        object_mask = self._object_mask(frame, params)
         
-        # Create blue background mask
-        lower_blue = np.array([hsv_hue_min, 50, 50])
-        upper_blue = np.array([hsv_hue_max, 255, 255])
-        blue_mask = cv2.inRange(hsv, lower_blue, upper_blue)
-        object_mask = cv2.bitwise_not(blue_mask)
+        # Label connected components and range-test their areas in one vectorized pass,
+        # so contours are only traced for the few components that can be counters
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(object_mask, connectivity=8, ltype=cv2.CV_32S)
+        component_areas = stats[1:, cv2.CC_STAT_AREA]
+        candidates = np.nonzero((component_areas > min_object_area) & (component_areas < max_object_area))[0] + 1
         
-        # Clean up mask
-        kernel_size = params.get('morphological_kernel_size', 7)
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        object_mask = cv2.morphologyEx(object_mask, cv2.MORPH_CLOSE, kernel)
-        object_mask = cv2.morphologyEx(object_mask, cv2.MORPH_OPEN, kernel)
+        if len(candidates) == 0:
+            return objects
         
-        # Find contours
-        contours, _ = cv2.findContours(object_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Trace the outer contour of each candidate component
+        contours = []
+        for label in candidates:
+            x_int, y_int, w, h = (int(v) for v in stats[label, :4])
+            component = (labels[y_int:y_int + h, x_int:x_int + w] == label).astype(np.uint8)
+            component_contours, _ = cv2.findContours(component, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                                     offset=(x_int, y_int))
+            contours.append(max(component_contours, key=cv2.contourArea))
         
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if min_object_area < area < max_object_area:
-                (x, y), radius = cv2.minEnclosingCircle(contour)
-                
-                # Calculate circularity
-                perimeter = cv2.arcLength(contour, True)
-                circularity = 4 * np.pi * area / (perimeter ** 2) if perimeter > 0 else 0
-                
-                min_circularity = params.get('min_circularity', 0.6)
-                if circularity >= min_circularity:
-                    x_int, y_int, w, h = cv2.boundingRect(contour)
-                    aspect_ratio = float(w) / h if h > 0 else 0
-                    
-                    if 0.7 < aspect_ratio < 1.3:
-                        # Calculate confidence based on circularity and size
-                        size_confidence = min(area / max_object_area, 1.0)
-                        confidence = (circularity * 0.7 + size_confidence * 0.3)
-                        
-                        if confidence >= min_confidence:
-                            obj = self._create_circle_object(int(x), int(y), int(radius), area, confidence)
-                            obj['circularity'] = round(circularity, 2)
-                            obj['aspect_ratio'] = round(aspect_ratio, 2)
-                            objects.append(obj)
+        # Shape filters as one branchless pass over per-contour arrays
+        count = len(contours)
+        areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=count)
+        perimeters = np.fromiter((cv2.arcLength(c, True) for c in contours), dtype=np.float64, count=count)
+        widths = stats[candidates, cv2.CC_STAT_WIDTH].astype(np.float64)
+        heights = stats[candidates, cv2.CC_STAT_HEIGHT].astype(np.float64)
+        circularities = np.where(perimeters > 0, 4 * np.pi * areas / np.maximum(perimeters ** 2, 1e-6), 0.0)
+        # Component bounding box comes straight from the stats array
+        aspect_ratios = np.where(heights > 0, widths / np.maximum(heights, 1), 0.0)
+        confidences = circularities * 0.7 + np.minimum(areas / max_object_area, 1.0) * 0.3
+        min_circularity = params.get('min_circularity', 0.6)
+        keep = ((areas > min_object_area) & (areas < max_object_area)
+                & (circularities >= min_circularity)
+                & (aspect_ratios > 0.7) & (aspect_ratios < 1.3)
+                & (confidences >= min_confidence))
         
-        return objects
+        kept = np.nonzero(keep)[0]
+        if len(kept) == 0:
+            return objects
+        
+        # Enclosing circles as (x, y, radius), truncated to whole pixels
+        circles = np.array([(*center, radius) for center, radius in
+                            (cv2.minEnclosingCircle(contours[i]) for i in kept.tolist())]).astype(np.int32)
+        x, y, r = circles.T
+        return self._make_objects(x - r, y - r, 2 * r, 2 * r, areas[kept], x, y, r, confidences[kept],
+                                  circularities[kept], aspect_ratios[kept])
     
-    def draw_objects(self, frame: np.ndarray, objects: List[Dict], color: Tuple[int, int, int] = (0, 255, 0)) -> np.ndarray:
+    def draw_objects(self, frame: np.ndarray, objects: Union[List[Dict], np.ndarray],
+                     color: Tuple[int, int, int] = (0, 255, 0), inplace: bool = False) -> np.ndarray:
         """
         Draw detected counters on frame with bounding box and info overlay.
 
         Args:
             frame: Input frame
-            objects: List of detected counter objects
+            objects: List of detected counter objects, or an OBJ_DTYPE array (read column-wise)
             color: Color for annotations (default: green)
+            inplace: Draw directly on frame instead of a copy (only when the caller owns frame)
 
         Returns:
-            Annotated frame with visual overlays
+            Annotated frame with visual overlays - frame itself when there is nothing to draw (no copy is made)
         """
-        annotated = frame.copy()
+        if objects is None or len(objects) == 0:
+            return frame
+
+        # With UMAT_DRAW the shapes are drawn on a device copy, which also replaces frame.copy()
+        canvas = cv2.UMat(frame) if UMAT_DRAW else None
+        annotated = frame if inplace or canvas is not None else frame.copy()
 
-        for obj in objects:
-            x, y = obj['x'], obj['y']
-            w, h = obj['width'], obj['height']
-            center = obj['center']
+        # Box geometry for every object in one vectorized pass: (n, 4) x, y, w, h
+        if isinstance(objects, np.ndarray):
+            boxes = np.stack((objects['x'], objects['y'], objects['w'], objects['h']), axis=1)
+            centers = list(zip(objects['cx'].tolist(), objects['cy'].tolist()))
+            labels = [f"Counter ({confidence*100:.0f}%, C:{circularity:.2f})"
+                      for confidence, circularity in objects[['conf', 'circularity']].tolist()]
+        else:
+            boxes = np.array([(o['x'], o['y'], o['width'], o['height']) for o in objects], dtype=np.int32)
+            centers = [o['center'] for o in objects]
+            labels = [self._object_label(obj) for obj in objects]
+        x1, y1 = boxes[:, 0], boxes[:, 1]
+        x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+        radii = (np.maximum(boxes[:, 2], boxes[:, 3]) // 2).tolist()
 
-            # Draw bounding box
-            cv2.rectangle(annotated, (x, y), (x + w, y + h), color, 2)
+        # Draw all bounding boxes in one polylines call: (n, 4 corners, 2) int32
+        corners = np.stack((x1, y1, x2, y1, x2, y2, x1, y2), axis=1).reshape(-1, 4, 2)
+        if canvas is None:
+            cv2.polylines(annotated, corners, True, color, 2)
+            target = annotated
+        else:
+            # The UMat overload of polylines wants one UMat per polygon, so draw rectangles on the device
+            for bx1, by1, bx2, by2 in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()):
+                cv2.rectangle(canvas, (bx1, by1), (bx2, by2), color, 2)
+            target = canvas
 
+        for center, radius in zip(centers, radii):
             # Draw center point
-            cv2.circle(annotated, center, 5, color, -1)
+            cv2.circle(target, center, 5, color, -1)
 
             # Draw circle around center for visual emphasis
-            radius = max(w, h) // 2
-            cv2.circle(annotated, center, radius, color, 2)
+            cv2.circle(target, center, radius, color, 2)
 
-            # Draw label with counter number
-            counter_number = obj.get('counterNumber')
-            confidence = obj.get('confidence', 0)
-            
-            if counter_number:
-                label = f"Counter {counter_number}"
-                if confidence > 0:
-                    label += f" ({confidence*100:.0f}%)"
+        # One download; labels below are CPU work (compiled fill and glyph scatter)
+        if canvas is not None:
+            if inplace:
+                annotated[...] = canvas.get()
             else:
-                # Fallback if no counter number assigned
-                circularity = obj.get('circularity', 0)
-                label = f"Counter ({confidence*100:.0f}%, C:{circularity:.2f})"
+                annotated = canvas.get()
 
-            # Draw label background for better visibility
-            (text_width, text_height), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
-            cv2.rectangle(annotated, (x, y - text_height - 10), (x + text_width + 4, y), color, -1)
-            
-            # Draw label text
-            cv2.putText(annotated, label, (x + 2, y - 5),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        # Label backgrounds for better visibility, all filled in one compiled pass
+        sprites = [self._label_sprite(label) for label in labels]
+        text_sizes = np.array([sprite[:2] for sprite in sprites], dtype=np.int32).reshape(-1, 2)
+        backgrounds = np.stack((x1, y1 - text_sizes[:, 1] - 10, x1 + text_sizes[:, 0] + 4, y1), axis=1)
+        fill_rects(annotated, backgrounds, color)
+
+        # Label text: scatter each cached glyph mask at its origin instead of re-rasterizing it
+        frame_h, frame_w = annotated.shape[:2]
+        for x, y, (_, _, dys, dxs) in zip(x1.tolist(), y1.tolist(), sprites):
+            ys = dys + (y - 5)
+            xs = dxs + (x + 2)
+            inside = (ys >= 0) & (ys < frame_h) & (xs >= 0) & (xs < frame_w)
+            annotated[ys[inside], xs[inside]] = (255, 255, 255)
 
         return annotated
-    
+
+    def _label_sprite(self, label: str) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """
+        Rasterize a draw_objects label once and cache it
+
+        Args:
+            label: Label text (FONT_HERSHEY_SIMPLEX, scale 0.6, thickness 2)
+
+        Returns:
+            (text width, text height, row offsets, column offsets) - offsets of the glyph pixels
+            relative to the putText origin, so drawing the label is a single scatter
+        """
+        sprite = self._label_sprites.get(label)
+        if sprite is None:
+            (text_w, text_h), baseline = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            margin = 4  # Strokes extend past the getTextSize box by about half the thickness
+            canvas = np.zeros((text_h + baseline + 2 * margin, text_w + 2 * margin), dtype=np.uint8)
+            cv2.putText(canvas, label, (margin, margin + text_h), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 255, 2)
+            dys, dxs = np.nonzero(canvas)
+            if len(self._label_sprites) >= 1024:
+                self._label_sprites.clear()  # Counter numbers keep growing; don't let the cache grow with them
+            sprite = self._label_sprites[label] = (text_w, text_h, dys - (margin + text_h), dxs - margin)
+        return sprite
+
+    @staticmethod
+    def _object_label(obj: Dict) -> str:
+        """Label text for a detected counter: its number if assigned, plus confidence"""
+        counter_number = obj.get('counterNumber')
+        confidence = obj.get('confidence', 0)
+        
+        if counter_number:
+            label = f"Counter {counter_number}"
+            if confidence > 0:
+                label += f" ({confidence*100:.0f}%)"
+            return label
+        
+        # Fallback if no counter number assigned
+        circularity = obj.get('circularity', 0)
+        return f"Counter ({confidence*100:.0f}%, C:{circularity:.2f})"
+
+
+    def _defects(self):
+        """The defect detector, created on first use (the defect module is only imported then)"""
+        if self._defect_detector is None:
+            from defect_detection import DefectDetector
+            self._defect_detector = DefectDetector(self._detect_lock, self._scratch_buffer, self._to_gray,
+                                                   self._kernel, self._morph_separable)
+        return self._defect_detector
+
     def detect_defects(self, frame: np.ndarray, method: str = 'blob', params: Optional[Dict] = None) -> Dict:
         """
         Detect defects in an image frame
         
-        Note: Defect detection is currently disabled - focus on object/counter detection first
-        """
-        return {
-            'defects_found': False,
-            'defect_count': 0,
-            'defects': [],
-            'confidence': 0.0,
-            'method': method,
-            'timestamp': time.time(),
-            'note': 'Defect detection is currently disabled'
-        }
-    def _detect_blobs(self, gray: np.ndarray, min_area: int = 10, max_area: int = 5000,
-                     adaptive_block: int = 11, adaptive_c: int = 2, kernel_size: int = 3) -> List[Dict]:
-        """Stub - defect detection disabled"""
-        return []
-    
-    def _detect_contours(self, gray: np.ndarray, min_area: int = 50, max_area: int = 10000,
-                        canny_low: int = 50, canny_high: int = 150, aspect_ratio_min: float = 0.2,
-                        aspect_ratio_max: float = 5.0, dilation_iterations: int = 1, kernel_size: int = 3) -> List[Dict]:
-        """Stub - defect detection disabled"""
-        return []
-    
-    def _detect_edges(self, gray: np.ndarray, canny_low: int = 30, canny_high: int = 100,
-                     hough_threshold: int = 50, min_line_length: int = 30, max_line_gap: int = 10,
-                     line_grouping_distance: int = 30, min_lines_per_defect: int = 2, min_defect_size: int = 10) -> List[Dict]:
-        """Stub - defect detection disabled"""
-        return []
-    
-    def _merge_nearby_defects(self, defects: List[Dict], threshold: int = 20) -> List[Dict]:
-        """Stub - defect detection disabled"""
-        return defects if defects else []
-    
-    def _calculate_confidence(self, defects: List[Dict], frame_shape: Tuple[int, int, int]) -> float:
-        """Stub - defect detection disabled, always returns 0.0"""
-        return 0.0
-    
-    def draw_defects(self, frame: np.ndarray, defects: List[Dict]) -> np.ndarray:
+        Args:
+            frame: Input image frame (BGR format)
+            method: Detection method - 'blob' (default), 'contour', 'edge' or 'all'
+            params: Optional detection parameters:
+                - half_resolution: Run the detectors on a pyrDown'd image (default: True)
+                - merge_distance: Merge defects whose centers are closer than this (default: 20)
+                - blob / contour / edge: Dicts of keyword arguments for _detect_blobs,
+                  _detect_contours and _detect_edges (sizes in full-resolution pixels)
+        
+        Returns:
+            Dictionary with defect detection results
         """
-        Stub - defect detection disabled, returns frame unchanged
+        return self._defects().detect_defects(frame, method, params)
+
+    def draw_defects(self, frame: np.ndarray, defects: List[Dict], inplace: bool = False,
+                     max_labels: int = 20) -> np.ndarray:
         """
-        # Defect detection is disabled, just return the frame as-is
-        return frame.copy()
+        Draw detected defects on frame with bounding box and type label.
+
+        Args:
+            frame: Input frame
+            defects: List of detected defects
+            inplace: Draw directly on frame instead of a copy (only when the caller owns frame)
+            max_labels: Only the largest max_labels defects (by area) get a text label
 
+        Returns:
+            Annotated frame - frame itself when there is nothing to draw (no copy is made)
+        """
+        return self._defects().draw_defects(frame, defects, inplace=inplace, max_labels=max_labels)
@@ -3,10 +3,15 @@ Backend Diagnostic Script
 Checks if backend is configured correctly for YOLO detection
 """
 
+import mmap
 import os
+import re
 import sys
 import json
 
+# Resolved once; config.json and app.py both live next to this script
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
 print("="*60)
 print("Backend YOLO Detection Diagnostic")
 print("="*60)
@@ -15,10 +20,11 @@ print()
 # Check 1: Model file exists
 print("[1/5] Checking model file...")
 model_path = os.path.expanduser('~/counter_detector.pt')
-if os.path.exists(model_path):
-    size_mb = os.path.getsize(model_path) / (1024 * 1024)
+try:
+    # One stat() gives both existence and size
+    size_mb = os.stat(model_path).st_size / (1024 * 1024)
     print(f"  ✓ Model found: {model_path} ({size_mb:.2f} MB)")
-else:
+except FileNotFoundError:
     print(f"  ✗ Model NOT found at: {model_path}")
     print("  Expected location: ~/counter_detector.pt")
 print()
@@ -52,36 +58,45 @@ print()
 
 # Check 4: Config file
 print("[4/5] Checking config.json...")
-config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-if os.path.exists(config_path):
-    try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        print("  ✓ config.json exists and is valid JSON")
-        if 'camera' in config:
-            print(f"  ✓ Camera config found: {config['camera']}")
-        else:
-            print("  ⚠ Camera config not found (will use defaults)")
-    except Exception as e:
-        print(f"  ✗ Error reading config: {e}")
-else:
+config_path = os.path.join(BACKEND_DIR, 'config.json')
+try:
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    print("  ✓ config.json exists and is valid JSON")
+    if 'camera' in config:
+        print(f"  ✓ Camera config found: {config['camera']}")
+    else:
+        print("  ⚠ Camera config not found (will use defaults)")
+except FileNotFoundError:
     print("  ⚠ config.json not found (will use defaults)")
+except Exception as e:
+    print(f"  ✗ Error reading config: {e}")
 print()
 
 # Check 5: Backend code
 print("[5/5] Checking backend code...")
-app_path = os.path.join(os.path.dirname(__file__), 'app.py')
-if os.path.exists(app_path):
-    with open(app_path, 'r') as f:
-        content = f.read()
-        if 'counter_detector.pt' in content:
-            print("  ✓ app.py references counter_detector.pt")
-        if 'load_yolo_model' in content:
-            print("  ✓ app.py has load_yolo_model function")
-        if "object_method = data.get('object_method', 'yolo')" in content:
-            print("  ✓ app.py defaults to 'yolo' method")
+app_path = os.path.join(BACKEND_DIR, 'app.py')
+yolo_default = b"object_method = data.get('object_method', 'yolo')"
+markers = re.compile(b'|'.join(re.escape(m) for m in (b'counter_detector.pt', b'load_yolo_model', yolo_default)))
+try:
+    # All three markers in one pass over a read-only mapping of the file (no copy or decode into a str)
+    with open(app_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            found = set()  # mmap refuses to map an empty file
         else:
-            print("  ⚠ app.py might not default to 'yolo' method")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                found = set(markers.findall(mm))
+except FileNotFoundError:
+    found = None
+if found is not None:
+    if b'counter_detector.pt' in found:
+        print("  ✓ app.py references counter_detector.pt")
+    if b'load_yolo_model' in found:
+        print("  ✓ app.py has load_yolo_model function")
+    if yolo_default in found:
+        print("  ✓ app.py defaults to 'yolo' method")
+    else:
+        print("  ⚠ app.py might not default to 'yolo' method")
 else:
     print("  ✗ app.py not found")
 print()
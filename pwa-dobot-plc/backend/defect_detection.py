@@ -0,0 +1,405 @@
+"""
+Defect detection for the camera service
+Blob, contour and edge (Hough line) defect detectors plus merging and drawing.
+Imported by CameraService on the first detect_defects/draw_defects call only.
+"""
+
+import logging
+import time
+from typing import Callable, ContextManager, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from camera_kernels import close_pairs, filter_contours, group_boxes, union_find
+
+logger = logging.getLogger(__name__)
+
+# Internal defect record (one row per defect); converted to dicts only in detect_defects' result
+DEFECT_TYPES = ('blob', 'contour', 'edge', 'merged')
+DEFECT_DTYPE = np.dtype([
+    ('type', 'u1'),  # Index into DEFECT_TYPES
+    ('x', 'i4'), ('y', 'i4'), ('w', 'i4'), ('h', 'i4'),
+    ('area', 'f4'),
+    ('cx', 'i4'), ('cy', 'i4'),
+    ('line_count', 'i4')  # Hough segments in an edge defect, 0 otherwise
+])
+
+
+class DefectDetector:
+    """Defect pipeline sharing a CameraService's scratch buffers, detection lock and gray conversion"""
+
+    def __init__(self, lock: ContextManager, scratch_buffer: Callable[..., np.ndarray],
+                 to_gray: Callable[[np.ndarray], np.ndarray], kernel: Callable[[int], np.ndarray],
+                 morph_separable: Callable[[np.ndarray, int, int], np.ndarray]):
+        """
+        Args:
+            lock: Held while detecting - the scratch buffers are shared with the counter detectors
+            scratch_buffer: scratch_buffer(name, shape) -> reusable uint8 buffer of that shape
+            to_gray: BGR frame -> grayscale image
+            kernel: kernel(size) -> square structuring element
+            morph_separable: morph_separable(mask, op, size) applies op to mask in place
+        """
+        self._lock = lock
+        self._scratch_buffer = scratch_buffer
+        self._to_gray = to_gray
+        self._kernel = kernel
+        self._morph_separable = morph_separable
+
+    def detect_defects(self, frame: np.ndarray, method: str = 'blob', params: Optional[Dict] = None) -> Dict:
+        """Detect defects in an image frame (see CameraService.detect_defects)"""
+        if frame is None:
+            return {
+                'defects_found': False,
+                'defect_count': 0,
+                'defects': [],
+                'confidence': 0.0,
+                'error': 'No frame provided'
+            }
+        if method not in ('blob', 'contour', 'edge', 'all'):
+            return {
+                'defects_found': False,
+                'defect_count': 0,
+                'defects': [],
+                'confidence': 0.0,
+                'error': f'Unknown defect detection method: {method}'
+            }
+        
+        if params is None:
+            params = {}
+        
+        try:
+            # Shares the grayscale/edge scratch buffers with the counter detectors
+            with self._lock:
+                gray = self._to_gray(frame)
+                
+                # One pyramid step: 4x fewer pixels for every threshold/Canny/Hough pass below
+                scale = 1
+                if params.get('half_resolution', True):
+                    h, w = gray.shape
+                    gray = cv2.pyrDown(gray, dst=self._scratch_buffer('defect_gray_small', ((h + 1) // 2, (w + 1) // 2)))
+                    scale = 2
+                area_scale = scale * scale
+                
+                # Each detector keeps its own Canny thresholds (contour 50/150, edge 30/100 by
+                # default); with method='all' one edge map is shared only when they match
+                edge_params = params.get('edge', {})
+                contour_params = params.get('contour', {})
+                contour_canny = (contour_params.get('canny_low', 50), contour_params.get('canny_high', 150))
+                edge_canny = (edge_params.get('canny_low', 30), edge_params.get('canny_high', 100))
+                contour_edges = line_edges = None
+                if method in ('contour', 'all'):
+                    contour_edges = cv2.Canny(gray, *contour_canny,
+                                              edges=self._scratch_buffer('defect_edges', gray.shape))
+                if method in ('edge', 'all'):
+                    if contour_edges is not None and edge_canny == contour_canny:
+                        line_edges = contour_edges
+                    else:
+                        line_edges = cv2.Canny(gray, *edge_canny,
+                                               edges=self._scratch_buffer('defect_line_edges', gray.shape))
+                
+                found = []
+                if method in ('blob', 'all'):
+                    blob_params = params.get('blob', {})
+                    found.append(self._detect_blobs(
+                        gray,
+                        min_area=blob_params.get('min_area', 10) / area_scale,
+                        max_area=blob_params.get('max_area', 5000) / area_scale,
+                        adaptive_block=blob_params.get('adaptive_block', 11),
+                        adaptive_c=blob_params.get('adaptive_c', 2),
+                        kernel_size=blob_params.get('kernel_size', 3)))
+                if method in ('contour', 'all'):
+                    found.append(self._detect_contours(
+                        gray,
+                        min_area=contour_params.get('min_area', 50) / area_scale,
+                        max_area=contour_params.get('max_area', 10000) / area_scale,
+                        aspect_ratio_min=contour_params.get('aspect_ratio_min', 0.2),
+                        aspect_ratio_max=contour_params.get('aspect_ratio_max', 5.0),
+                        dilation_iterations=contour_params.get('dilation_iterations', 1),
+                        kernel_size=contour_params.get('kernel_size', 3),
+                        edges=contour_edges))
+                if method in ('edge', 'all'):
+                    found.append(self._detect_edges(
+                        gray,
+                        # A line at half resolution collects half the accumulator votes
+                        hough_threshold=max(1, round(edge_params.get('hough_threshold', 50) / scale)),
+                        min_line_length=edge_params.get('min_line_length', 30) / scale,
+                        max_line_gap=edge_params.get('max_line_gap', 10) / scale,
+                        line_grouping_distance=edge_params.get('line_grouping_distance', 30) / scale,
+                        min_lines_per_defect=edge_params.get('min_lines_per_defect', 2),
+                        min_defect_size=edge_params.get('min_defect_size', 10) / scale,
+                        edges=line_edges))
+            
+            defects = np.concatenate(found)
+            if scale != 1:
+                defects = self._scale_defects(defects, scale)
+            defects = self._merge_nearby_defects(defects, params.get('merge_distance', 20))
+            confidence = self._calculate_confidence(defects, frame.shape)
+            
+            return {
+                'defects_found': len(defects) > 0,
+                'defect_count': len(defects),
+                'defects': self._defects_to_dicts(defects),
+                'confidence': confidence,
+                'method': method,
+                'timestamp': time.time()
+            }
+        
+        except Exception as e:
+            logger.error(f"Error in defect detection: {e}")
+            return {
+                'defects_found': False,
+                'defect_count': 0,
+                'defects': [],
+                'confidence': 0.0,
+                'error': str(e)
+            }
+
+    def _make_defects(self, defect_type: str, x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray,
+                      area: np.ndarray, line_count: Optional[np.ndarray] = None) -> np.ndarray:
+        """Build a DEFECT_DTYPE array from per-defect columns (center = box center)"""
+        defects = np.zeros(len(x), dtype=DEFECT_DTYPE)
+        defects['type'] = DEFECT_TYPES.index(defect_type)
+        defects['x'] = x
+        defects['y'] = y
+        defects['w'] = w
+        defects['h'] = h
+        defects['area'] = area
+        defects['cx'] = defects['x'] + defects['w'] // 2
+        defects['cy'] = defects['y'] + defects['h'] // 2
+        if line_count is not None:
+            defects['line_count'] = line_count
+        return defects
+
+    def _defects_to_dicts(self, defects: np.ndarray) -> List[Dict]:
+        """Convert a DEFECT_DTYPE array to the dicts returned by detect_defects"""
+        result = []
+        for defect_type, x, y, w, h, area, cx, cy, line_count in defects.tolist():
+            defect = {
+                'type': DEFECT_TYPES[defect_type],
+                'x': x,
+                'y': y,
+                'width': w,
+                'height': h,
+                'area': area,
+                'center': (cx, cy)
+            }
+            if line_count:
+                defect['line_count'] = line_count
+            result.append(defect)
+        return result
+
+    def _scale_defects(self, defects: np.ndarray, scale: int) -> np.ndarray:
+        """Map defects found on a downscaled image back to full-resolution coordinates (in place)"""
+        for field in ('x', 'y', 'w', 'h', 'cx', 'cy'):
+            defects[field] *= scale
+        defects['area'] *= scale * scale
+        return defects
+
+    def _detect_blobs(self, gray: np.ndarray, min_area: int = 10, max_area: int = 5000,
+                     adaptive_block: int = 11, adaptive_c: int = 2, kernel_size: int = 3) -> np.ndarray:
+        """
+        Detect blob-like defects (spots, pits, dirt) using adaptive thresholding
+        
+        Args:
+            gray: Grayscale image
+            min_area: Minimum blob area in pixels
+            max_area: Maximum blob area in pixels
+            adaptive_block: Adaptive threshold block size (odd)
+            adaptive_c: Constant subtracted from the local mean
+            kernel_size: Morphology kernel size for mask cleanup
+            
+        Returns:
+            Blob defects (DEFECT_DTYPE array)
+        """
+        # Dark spots relative to their neighbourhood become foreground
+        thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV,
+                                       adaptive_block, adaptive_c,
+                                       dst=self._scratch_buffer('defect_thresh', gray.shape))
+        
+        # Close small gaps, then remove speckle noise
+        self._morph_separable(thresh, cv2.MORPH_CLOSE, kernel_size)
+        self._morph_separable(thresh, cv2.MORPH_OPEN, kernel_size)
+        
+        # Box and pixel area of every blob in one labelling pass, range-tested as an array
+        _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8, ltype=cv2.CV_32S)
+        stats = stats[1:]
+        areas = stats[:, cv2.CC_STAT_AREA]
+        stats = stats[(areas > min_area) & (areas < max_area)]
+        
+        return self._make_defects('blob', stats[:, cv2.CC_STAT_LEFT], stats[:, cv2.CC_STAT_TOP],
+                                  stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT],
+                                  stats[:, cv2.CC_STAT_AREA])
+
+    def _detect_contours(self, gray: np.ndarray, min_area: int = 50, max_area: int = 10000,
+                        canny_low: int = 50, canny_high: int = 150, aspect_ratio_min: float = 0.2,
+                        aspect_ratio_max: float = 5.0, dilation_iterations: int = 1, kernel_size: int = 3,
+                        edges: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Detect defects (scratches, cracks, dents) as closed edge contours
+        
+        Args:
+            gray: Grayscale image
+            min_area: Minimum contour area in pixels
+            max_area: Maximum contour area in pixels
+            canny_low: Canny lower threshold
+            canny_high: Canny upper threshold
+            aspect_ratio_min: Minimum bounding box width/height
+            aspect_ratio_max: Maximum bounding box width/height
+            dilation_iterations: Edge dilation passes to close small gaps (0 = none)
+            kernel_size: Dilation kernel size
+            edges: Precomputed Canny edge map of gray (canny_low/high are then ignored; not modified)
+            
+        Returns:
+            Contour defects (DEFECT_DTYPE array)
+        """
+        if edges is None:
+            edges = cv2.Canny(gray, canny_low, canny_high, edges=self._scratch_buffer('defect_edges', gray.shape))
+        if dilation_iterations > 0:
+            # Separate buffer - the edge map may be shared with _detect_edges
+            edges = cv2.dilate(edges, self._kernel(kernel_size), dst=self._scratch_buffer('defect_dilated', gray.shape),
+                               iterations=dilation_iterations)
+        
+        # Teh-Chin approximation: fewer points per contour. It is not exact - bounding boxes can
+        # shift by a pixel and small-blob areas by up to ~10%, which these loose area filters tolerate.
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_L1)
+        if not contours:
+            return np.empty(0, dtype=DEFECT_DTYPE)
+        
+        # Gather x, y, w, h, area per contour, then filter them all in one compiled pass
+        stats = np.empty((len(contours), 5), dtype=np.float32)
+        for i, contour in enumerate(contours):
+            stats[i, :4] = cv2.boundingRect(contour)
+            stats[i, 4] = cv2.contourArea(contour)
+        stats = stats[filter_contours(stats, min_area, max_area, aspect_ratio_min, aspect_ratio_max)]
+        
+        return self._make_defects('contour', stats[:, 0], stats[:, 1], stats[:, 2], stats[:, 3], stats[:, 4])
+
+    def _detect_edges(self, gray: np.ndarray, canny_low: int = 30, canny_high: int = 100,
+                     hough_threshold: int = 50, min_line_length: int = 30, max_line_gap: int = 10,
+                     line_grouping_distance: int = 30, min_lines_per_defect: int = 2, min_defect_size: int = 10,
+                     edges: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Detect linear defects (scratches, cracks) by grouping nearby Hough line segments
+        
+        Args:
+            gray: Grayscale image
+            canny_low: Canny lower threshold
+            canny_high: Canny upper threshold
+            hough_threshold: HoughLinesP accumulator threshold
+            min_line_length: Minimum segment length
+            max_line_gap: Maximum gap joined into one segment
+            line_grouping_distance: Segments whose midpoints are closer than this are grouped
+            min_lines_per_defect: Minimum segments in a group to report it
+            min_defect_size: Minimum group bounding box side (larger of width/height)
+            edges: Precomputed Canny edge map of gray (canny_low/high are then ignored)
+            
+        Returns:
+            Edge defects (DEFECT_DTYPE array)
+        """
+        if edges is None:
+            edges = cv2.Canny(gray, canny_low, canny_high, edges=self._scratch_buffer('defect_edges', gray.shape))
+        lines = cv2.HoughLinesP(edges, 1, np.pi / 180, hough_threshold,
+                                minLineLength=min_line_length, maxLineGap=max_line_gap)
+        if lines is None or len(lines) < min_lines_per_defect:
+            return np.empty(0, dtype=DEFECT_DTYPE)
+        
+        # Link segments whose midpoints are within the grouping distance (float32 pairwise matrix)
+        segments = lines[:, 0, :].astype(np.float32)
+        mid_x = (segments[:, 0] + segments[:, 2]) * 0.5
+        mid_y = (segments[:, 1] + segments[:, 3]) * 0.5
+        d2 = (mid_x[:, None] - mid_x) ** 2 + (mid_y[:, None] - mid_y) ** 2
+        pairs = np.argwhere(np.triu(d2 < np.float32(line_grouping_distance) ** 2, 1))
+        labels = union_find(len(segments), pairs)
+        _, group_ids, line_counts = np.unique(labels, return_inverse=True, return_counts=True)
+        num_groups = len(line_counts)
+        
+        # Bounding box of every group's segment endpoints
+        seg = lines[:, 0, :]
+        gx1 = np.full(num_groups, np.iinfo(np.int32).max)
+        gy1 = np.full(num_groups, np.iinfo(np.int32).max)
+        gx2 = np.full(num_groups, np.iinfo(np.int32).min)
+        gy2 = np.full(num_groups, np.iinfo(np.int32).min)
+        np.minimum.at(gx1, group_ids, np.minimum(seg[:, 0], seg[:, 2]))
+        np.minimum.at(gy1, group_ids, np.minimum(seg[:, 1], seg[:, 3]))
+        np.maximum.at(gx2, group_ids, np.maximum(seg[:, 0], seg[:, 2]))
+        np.maximum.at(gy2, group_ids, np.maximum(seg[:, 1], seg[:, 3]))
+        widths = gx2 - gx1
+        heights = gy2 - gy1
+        
+        keep = (line_counts >= min_lines_per_defect) & (np.maximum(widths, heights) >= min_defect_size)
+        return self._make_defects('edge', gx1[keep], gy1[keep], widths[keep], heights[keep],
+                                  widths[keep] * heights[keep], line_counts[keep])
+
+    def _merge_nearby_defects(self, defects: np.ndarray, threshold: int = 20) -> np.ndarray:
+        """
+        Merge defects whose centers are closer than threshold pixels (transitively) into one box.
+        Neighbour pairs come from a KD-tree, so this is O(n log n) rather than all-pairs.
+        Groups are returned in order of their first member; single defects come back unchanged.
+        """
+        n = len(defects)
+        if n <= 1:
+            return defects
+        
+        centers = np.stack((defects['cx'], defects['cy']), axis=1)
+        labels = union_find(n, close_pairs(centers, threshold))
+        # Labels are each group's smallest member index, so unique() keeps first-member order
+        _, group_ids = np.unique(labels, return_inverse=True)
+        num_groups = group_ids.max() + 1
+        if num_groups == n:
+            return defects
+        
+        # Group-reduce boxes, areas, line counts and types on the columns
+        gx1, gy1, gx2, gy2 = group_boxes(
+            np.stack((defects['x'], defects['y'], defects['x'] + defects['w'], defects['y'] + defects['h']), axis=1),
+            group_ids, num_groups).T
+        garea = np.zeros(num_groups, dtype=np.float32)
+        np.add.at(garea, group_ids, defects['area'])
+        glines = np.zeros(num_groups, dtype=np.int32)
+        np.add.at(glines, group_ids, defects['line_count'])
+        type_min = np.full(num_groups, 255, dtype=np.uint8)
+        type_max = np.zeros(num_groups, dtype=np.uint8)
+        np.minimum.at(type_min, group_ids, defects['type'])
+        np.maximum.at(type_max, group_ids, defects['type'])
+        
+        merged = self._make_defects('merged', gx1, gy1, gx2 - gx1, gy2 - gy1, garea, glines)
+        # Groups of a single kind keep that kind
+        merged['type'] = np.where(type_min == type_max, type_min, DEFECT_TYPES.index('merged'))
+        return merged
+
+    def _calculate_confidence(self, defects: np.ndarray, frame_shape: Tuple[int, int, int]) -> float:
+        """
+        Overall confidence that the frame shows a defective part.
+        Grows with the number of defects and the fraction of the frame they cover.
+        """
+        if len(defects) == 0:
+            return 0.0
+        frame_area = frame_shape[0] * frame_shape[1]
+        coverage = float(defects['area'].sum()) / frame_area if frame_area else 0.0
+        confidence = 0.5 + 0.1 * min(len(defects), 3) + min(coverage * 10, 0.2)
+        return round(min(confidence, 1.0), 2)
+
+    def draw_defects(self, frame: np.ndarray, defects: List[Dict], inplace: bool = False,
+                     max_labels: int = 20) -> np.ndarray:
+        """Draw detected defects on frame (see CameraService.draw_defects)"""
+        if not defects:
+            return frame
+
+        annotated = frame if inplace else frame.copy()
+        color = (0, 0, 255)
+
+        # All boxes in one polylines call: (n, 4 corners, 2) int32
+        boxes = np.array([(d['x'], d['y'], d['width'], d['height']) for d in defects], dtype=np.int32)
+        x1, y1 = boxes[:, 0], boxes[:, 1]
+        x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+        corners = np.stack((x1, y1, x2, y1, x2, y2, x1, y2), axis=1).reshape(-1, 4, 2)
+        cv2.polylines(annotated, corners, True, color, 2)
+
+        # Text is the expensive part - label only the largest defects
+        areas = np.array([d['area'] for d in defects])
+        for i in np.argsort(-areas, kind='stable')[:max_labels].tolist():
+            cv2.putText(annotated, defects[i].get('type', 'defect'), (int(x1[i]), max(int(y1[i]) - 5, 10)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+
+        return annotated
+
@@ -3,22 +3,79 @@ Dobot Robot Communication Client - Improved pydobot Version
 Uses pydobot with proper parameter initialization and queue management
 """
 
+import asyncio
+import errno
+import importlib.util
 import logging
+import os
+import threading
 import time
-from typing import Dict, Optional, List
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Dict, NamedTuple, Optional, List, Tuple
 import struct
 
 logger = logging.getLogger(__name__)
 
-# Try to import pydobot
-try:
-    from pydobot import Dobot as PyDobot
-    from serial.tools import list_ports
-    import serial
-    DOBOT_AVAILABLE = True
-except ImportError:
-    DOBOT_AVAILABLE = False
+# Probe for pydobot without importing it - pydobot (and pyserial) load on first use, see _load_pydobot()
+DOBOT_AVAILABLE = (importlib.util.find_spec('pydobot') is not None
+                   and importlib.util.find_spec('serial') is not None)
+if not DOBOT_AVAILABLE:
     logger.warning("pydobot not installed - Dobot functionality disabled")
+PyDobot = None
+list_ports = None
+# Protocol message types, bound by _load_pydobot() along with PyDobot
+Message = None
+CommunicationProtocolIDs = None
+ControlValues = None
+PTPMode = None
+
+
+def _load_pydobot() -> bool:
+    """Import pydobot and pyserial's port list on first use; returns DOBOT_AVAILABLE"""
+    global PyDobot, list_ports, Message, CommunicationProtocolIDs, ControlValues, PTPMode, DOBOT_AVAILABLE
+    if PyDobot is not None or not DOBOT_AVAILABLE:
+        return DOBOT_AVAILABLE
+    try:
+        from pydobot import Dobot
+        from pydobot.message import Message as PyDobotMessage
+        from pydobot.enums import PTPMode as PyDobotPTPMode
+        from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs as PyDobotProtocolIDs
+        from pydobot.enums.ControlValues import ControlValues as PyDobotControlValues
+        from serial.tools import list_ports as serial_list_ports
+        PyDobot = Dobot
+        list_ports = serial_list_ports
+        Message = PyDobotMessage
+        CommunicationProtocolIDs = PyDobotProtocolIDs
+        ControlValues = PyDobotControlValues
+        PTPMode = PyDobotPTPMode
+    except ImportError as e:
+        # Found but broken - don't try again on every connect
+        DOBOT_AVAILABLE = False
+        logger.warning(f"pydobot could not be imported - Dobot functionality disabled: {e}")
+    return DOBOT_AVAILABLE
+
+
+# Last port a Dobot answered on - tried first on the next connect
+LAST_PORT_FILE = os.path.expanduser('~/.dobot_last_port')
+
+# USB-serial bridges used on Dobot controllers: Silicon Labs CP210x, QinHeng CH340
+DOBOT_USB_VIDS = {0x10C4, 0x1A86}
+
+# Port scans are reused for this long while /dev is unchanged (reconnect retries scan back to back)
+PORT_CACHE_TTL = 2.0  # seconds
+_PORT_CACHE = {'ts': 0.0, 'dev_mtime': None, 'ports': None}
+
+
+class Pose(NamedTuple):
+    """Robot position - x, y, z in mm, r in degrees"""
+    x: float
+    y: float
+    z: float
+    r: float
+
+
+# Returned when there is no connection or the pose read fails
+ZERO_POSE = Pose(0.0, 0.0, 0.0, 0.0)
 
 class DobotClient:
     """Dobot Robot Communication Client using Improved pydobot"""
@@ -35,6 +92,11 @@ class DobotClient:
     DEFAULT_VELOCITY_RATIO = 100  # 1-100%
     DEFAULT_ACCELERATION_RATIO = 100  # 1-100%
 
+    # Pose reads younger than this are answered from cache (frontend status polling)
+    POSE_CACHE_TTL = 0.05  # seconds
+    # Longest a caller waits for a pose read before treating the link as broken
+    POSE_TIMEOUT = 5.0  # seconds
+
     # Protocol constants (from official Dobot protocol)
     PROTOCOL_PTP_COMMON_PARAMS = 83  # Set PTP common parameters
     PROTOCOL_PTP_CMD = 84  # PTP command
@@ -42,25 +104,63 @@ class DobotClient:
     PROTOCOL_QUEUE_STOP = 241  # Stop queue execution
     PROTOCOL_QUEUE_CLEAR = 245  # Clear queue
 
-    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0'):
+    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0', low_latency: bool = True):
         """
         Initialize Dobot client with improved pydobot
 
         Args:
             use_usb: Use USB connection (True) or skip Dobot entirely (False)
             usb_path: USB device path for Dobot
+            low_latency: Switch the serial port to low-latency mode after opening it
         """
         self.use_usb = use_usb
         self.usb_path = usb_path
+        self.low_latency = low_latency
+        # connected implies device is set, so public methods only check connected
         self.connected = False
         self.last_error = ""
         self.device = None
         self.actual_port = None
+        # Optional pydobot methods, bound by _bind_device_methods()
+        self._speed_fn = None
+        self._start_queue_fn = None
+        self._stop_queue_fn = None
 
         # Movement parameters
         self.velocity_ratio = self.DEFAULT_VELOCITY_RATIO
         self.acceleration_ratio = self.DEFAULT_ACCELERATION_RATIO
 
+        # Pose reads run on one background thread: concurrent callers share a single in-flight
+        # serial round trip, and a hung link times out instead of blocking the request thread.
+        # Moves run one at a time on their own thread (separate from pose reads, which must not
+        # wait behind a long move), so concurrent requests can't interleave their commands.
+        self._start_workers()
+        self._pose_lock = threading.Lock()
+        self._pose_future = None
+        self._pose_cache: Optional[Pose] = None
+        self._pose_time = 0.0
+
+        # Bumped by emergency_stop()/disconnect(): moves submitted under an older generation are
+        # dropped instead of sent. The lock makes "check generation, send" atomic against the bump.
+        self._move_lock = threading.Lock()
+        self._move_generation = 0
+
+    @staticmethod
+    def _worker(name: str) -> ThreadPoolExecutor:
+        """Single-thread pool for one kind of serial work (the thread starts on first use)"""
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'dobot-{name}')
+
+    def _start_workers(self):
+        """Create the pose and move worker pools"""
+        self._pose_io = self._worker('pose')
+        self._move_io = self._worker('move')
+
+    def _reset_pose_state(self):
+        """Forget the cached pose and any pose read still in flight on the old connection"""
+        with self._pose_lock:
+            self._pose_future = None
+            self._pose_cache = None
+
     def connect(self) -> bool:
         """Connect to Dobot robot with improved initialization"""
         logger.info("🔌 Starting Dobot connection process...")
@@ -70,7 +170,7 @@ class DobotClient:
             logger.warning(f"⚠️ {self.last_error}")
             return False
             
-        if not DOBOT_AVAILABLE:
+        if not _load_pydobot():
             self.last_error = "pydobot library not installed or not available"
             logger.error(f"❌ {self.last_error}")
             logger.error("💡 To fix: pip install pydobot")
@@ -79,17 +179,20 @@ class DobotClient:
         logger.info(f"📋 Connection settings: use_usb={self.use_usb}, usb_path={self.usb_path}")
 
         try:
-            # Check if configured port exists
-            import os
-            if not os.path.exists(self.usb_path):
-                logger.warning(f"⚠️ Configured port {self.usb_path} does not exist")
-            else:
-                logger.info(f"✅ Configured port {self.usb_path} exists, attempting connection...")
-                if self._try_connect(self.usb_path):
+            # Port that worked last time (saved by _try_connect) - skips scanning and failed handshakes
+            last_port = self._load_last_port()
+            if last_port and last_port != self.usb_path:
+                logger.info(f"🔁 Trying last known Dobot port {last_port} first...")
+                if self._try_connect(last_port):
                     self._initialize_robot()
                     return True
-                else:
-                    logger.warning(f"⚠️ Failed to connect to configured port {self.usb_path}")
+
+            # Try the configured port - opening it reports a missing device itself (ENOENT)
+            logger.info(f"🔌 Trying configured port {self.usb_path}...")
+            if self._try_connect(self.usb_path):
+                self._initialize_robot()
+                return True
+            logger.warning(f"⚠️ Failed to connect to configured port {self.usb_path}")
 
             # If configured port fails, scan all USB ports
             logger.info("🔍 Scanning for available USB devices...")
@@ -107,17 +210,12 @@ class DobotClient:
 
             logger.info(f"📱 Found {len(available_ports)} USB devices: {', '.join(available_ports)}")
 
-            # Try each port
-            for i, port in enumerate(available_ports, 1):
-                if port == self.usb_path:
-                    logger.info(f"⏭️ Skipping {port} (already tried as configured port)")
-                    continue
-
-                logger.info(f"🔌 Attempting connection {i}/{len(available_ports)}: {port}")
-                if self._try_connect(port):
-                    logger.info(f"💡 TIP: Update your config to use USB path: {port}")
-                    self._initialize_robot()
-                    return True
+            # Try the remaining ports in parallel - a failing open can stall for seconds
+            candidates = [port for port in available_ports if port not in (self.usb_path, last_port)]
+            if candidates and self._connect_first(candidates):
+                logger.info(f"💡 TIP: Update your config to use USB path: {self.actual_port}")
+                self._initialize_robot()
+                return True
 
             self.last_error = f"Dobot not found on any USB port: {', '.join(available_ports)}"
             logger.error(f"❌ {self.last_error}")
@@ -131,80 +229,159 @@ class DobotClient:
 
         except Exception as e:
             self.last_error = f"Connection error: {str(e)}"
-            logger.error(f"❌ {self.last_error}")
-            import traceback
-            logger.error("📋 Full error traceback:")
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ {self.last_error}")
             return False
 
     def _try_connect(self, port: str) -> bool:
         """Try to connect to a specific port"""
+        device = self._open_port(port)
+        if device is None:
+            return False
+        self._adopt_device(device, port)
+        return True
+
+    def _connect_first(self, ports: List[str]) -> bool:
+        """
+        Probe several ports at once and keep the first one that opens
+
+        Args:
+            ports: Candidate serial ports
+
+        Returns:
+            True if a Dobot was connected on one of the ports
+        """
+        if len(ports) == 1:
+            return self._try_connect(ports[0])
+
+        logger.info(f"🔌 Attempting connection to {len(ports)} ports in parallel: {', '.join(ports)}")
+        winner_lock = threading.Lock()
+        won = []
+
+        def probe(port):
+            device = self._open_port(port)
+            if device is None:
+                return False
+            with winner_lock:
+                if not won:
+                    won.append(port)
+                    self._adopt_device(device, port)
+                    return True
+            # Another port won first - release this one
+            try:
+                device.close()
+            except Exception:
+                pass
+            return False
+
+        pool = ThreadPoolExecutor(max_workers=len(ports), thread_name_prefix='dobot-probe')
+        try:
+            for future in as_completed([pool.submit(probe, port) for port in ports]):
+                if future.result():
+                    return True
+            return False
+        finally:
+            # Don't wait for probes still stalled in open(); they close their device if they succeed late
+            pool.shutdown(wait=False)
+
+    def _open_port(self, port: str):
+        """
+        Open a PyDobot instance on a port and check it answers
+
+        Returns:
+            The PyDobot device, or None if the port could not be opened
+        """
         try:
             logger.info(f"🔌 Attempting connection to {port}...")
             
-            # Check port permissions
-            import stat
-            try:
-                port_stat = os.stat(port)
-                if not (port_stat.st_mode & stat.S_IRUSR and port_stat.st_mode & stat.S_IWUSR):
-                    logger.warning(f"⚠️ Port {port} may not have read/write permissions")
-                    logger.warning(f"💡 Try: sudo chmod 666 {port}")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not check port permissions: {e}")
-            
-            # Try to create PyDobot instance
+            # Try to create PyDobot instance - the open itself reports missing/busy/permission errors
             logger.info(f"🤖 Creating PyDobot instance on {port}...")
-            self.device = PyDobot(port=port, verbose=False)
+            device = PyDobot(port=port, verbose=False)
+            if self.low_latency:
+                self._enable_low_latency(device, port)
             
             # Test basic communication
             logger.info(f"📡 Testing communication with Dobot on {port}...")
             try:
                 # Try to get current pose to verify communication
-                pose = self.device.pose()
+                pose = device.pose()
                 logger.info(f"✅ Communication test successful! Current pose: {pose}")
             except Exception as e:
                 logger.warning(f"⚠️ Communication test failed: {e}")
                 # Still consider it connected if PyDobot instance was created
                 logger.info("🔄 Continuing despite communication test failure...")
             
-            self.connected = True
-            self.actual_port = port
-            logger.info(f"✅ Successfully connected to Dobot on {port}")
-            return True
+            return device
             
         except Exception as e:
             logger.error(f"❌ Connection to {port} failed: {e}")
             logger.error(f"📋 Error type: {type(e).__name__}")
             
             # Provide specific troubleshooting based on error type
-            if "Permission denied" in str(e):
-                logger.error("💡 Permission issue - try: sudo chmod 666 /dev/ttyACM*")
-            elif "No such file or directory" in str(e):
+            # (pyserial's SerialException carries the errno of the failed open)
+            error_code = getattr(e, 'errno', None)
+            if error_code == errno.EACCES or "Permission denied" in str(e):
+                logger.error(f"💡 Permission issue - try: sudo chmod 666 {port}")
+            elif error_code == errno.ENOENT or "No such file or directory" in str(e):
                 logger.error("💡 Port doesn't exist - check if device is connected")
-            elif "Device or resource busy" in str(e):
+            elif error_code == errno.EBUSY or "Device or resource busy" in str(e):
                 logger.error("💡 Port is busy - another program may be using it")
             elif "timeout" in str(e).lower():
                 logger.error("💡 Timeout - Dobot may not be responding or in wrong mode")
             else:
                 logger.error(f"💡 Unknown error - check Dobot power and USB connection")
                 
-            return False
+            return None
+
+    def _adopt_device(self, device, port: str):
+        """Make an opened device the client's connection"""
+        self._reset_pose_state()
+        self.device = device
+        self.connected = True
+        self.actual_port = port
+        self._save_last_port(port)
+        logger.info(f"✅ Successfully connected to Dobot on {port}")
+
+    @staticmethod
+    def _enable_low_latency(device, port: str):
+        """
+        Ask the serial driver to deliver responses immediately instead of after its latency timer
+        (16 ms by default on USB-serial bridges) - every pose read and move ack waits on it
+        """
+        try:
+            device.ser.set_low_latency_mode(True)
+            logger.info(f"⚡ Low-latency serial mode enabled on {port}")
+            return
+        except Exception as e:  # Not Linux, old pyserial, or the driver rejects ASYNC_LOW_LATENCY
+            logger.debug(f"set_low_latency_mode failed on {port}: {e}")
+
+        # usb-serial drivers (FTDI etc.) expose the timer in sysfs; needs write access
+        timer_path = f"/sys/bus/usb-serial/devices/{os.path.basename(os.path.realpath(port))}/latency_timer"
+        try:
+            with open(timer_path, 'w') as f:
+                f.write('1')
+            logger.info(f"⚡ Serial latency timer set to 1 ms ({timer_path})")
+        except OSError as e:
+            logger.debug(f"Could not set serial latency timer: {e}")
+
+    def _bind_device_methods(self):
+        """Look up the optional pydobot methods once per device (not every pydobot version has them)"""
+        self._speed_fn = getattr(self.device, 'speed', None)
+        self._start_queue_fn = getattr(self.device, 'start_queue', None)
+        self._stop_queue_fn = getattr(self.device, 'stop_queue', None)
 
     def _initialize_robot(self):
         """Initialize robot parameters - CRITICAL for movement to work"""
         if not self.device:
             return
 
+        self._bind_device_methods()
+
         try:
             logger.info("🔧 Initializing robot parameters...")
 
             # CRITICAL: Clear all alarms first!
             # This was the issue preventing movement
             try:
-                from pydobot.message import Message
-                from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
-                from pydobot.enums.ControlValues import ControlValues
-
                 msg = Message()
                 msg.id = CommunicationProtocolIDs.CLEAR_ALL_ALARMS_STATE
                 msg.ctrl = ControlValues.ONE
@@ -229,13 +406,13 @@ class DobotClient:
             logger.info("✅ Robot initialized successfully")
 
         except Exception as e:
-            logger.error(f"❌ Error initializing robot: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Error initializing robot: {e}")
 
     def disconnect(self):
         """Disconnect from Dobot"""
-        if self.connected and self.device:
+        self._cancel_pending_moves()
+        # Also after a pose timeout has cleared connected - the port is still open
+        if self.device is not None:
             try:
                 self.device.close()
                 self.connected = False
@@ -244,34 +421,108 @@ class DobotClient:
             except Exception as e:
                 logger.error(f"❌ Error disconnecting from Dobot: {e}")
 
+        # Retire the worker pools: closing the port lets a stuck pose read return, and the next
+        # connect() gets fresh workers instead of queueing behind it. Queued moves still run,
+        # see the bumped generation and resolve False.
+        self._pose_io.shutdown(wait=False)
+        self._move_io.shutdown(wait=False)
+        self._start_workers()
+        self._reset_pose_state()
+
     def get_pose(self) -> Dict[str, float]:
-        """Get current robot position"""
-        if not self.connected or not self.device:
-            return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'r': 0.0}
+        """Get current robot position (cached for POSE_CACHE_TTL seconds)"""
+        return self._read_pose()._asdict()
+
+    def _read_pose(self) -> Pose:
+        """get_pose without the dict conversion - used internally by move_to"""
+        if not self.connected:
+            return ZERO_POSE
+
+        with self._pose_lock:
+            if self._pose_cache is not None and time.monotonic() - self._pose_time < self.POSE_CACHE_TTL:
+                return self._pose_cache
+            # Join a read that is already in flight rather than queueing another one
+            future = self._pose_future
+            if future is None:
+                future = self._pose_future = self._pose_io.submit(self.device.pose)
 
         try:
             # pydobot.pose() returns tuple: (x, y, z, r, j1, j2, j3, j4)
-            pose = self.device.pose()
+            pose = future.result(timeout=self.POSE_TIMEOUT)
 
             # Check if pose is None (communication failure)
             if pose is None:
                 logger.warning("⚠️ Dobot returned None for pose - connection may be broken")
                 self.last_error = "Communication lost - pose returned None"
                 self.connected = False
-                return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'r': 0.0}
-
-            return {
-                'x': float(pose[0]),
-                'y': float(pose[1]),
-                'z': float(pose[2]),
-                'r': float(pose[3])
-            }
+                return ZERO_POSE
+
+            result = Pose(float(pose[0]), float(pose[1]), float(pose[2]), float(pose[3]))
+            with self._pose_lock:
+                self._pose_cache = result
+                self._pose_time = time.monotonic()
+            return result
+        except FutureTimeoutError:
+            self.last_error = f"Error getting pose: no response within {self.POSE_TIMEOUT}s"
+            logger.error(self.last_error)
+            # Don't let the next read (possibly on a new connection) join the hung one, or queue
+            # behind it on the stuck worker thread
+            with self._pose_lock:
+                if self._pose_future is future:
+                    self._pose_future = None
+                    self._pose_io.shutdown(wait=False)
+                    self._pose_io = self._worker('pose')
+            self.connected = False
+            return ZERO_POSE
         except Exception as e:
             self.last_error = f"Error getting pose: {str(e)}"
             logger.error(self.last_error)
             # Mark as disconnected on communication error
             self.connected = False
-            return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'r': 0.0}
+            return ZERO_POSE
+        finally:
+            with self._pose_lock:
+                if self._pose_future is future and future.done():
+                    self._pose_future = None
+
+    def _invalidate_pose(self):
+        """Drop the cached pose once the robot has been told to move"""
+        with self._pose_lock:
+            self._pose_cache = None
+
+    def _wait_until_settled(self, target: Tuple[float, float, float], timeout: float = 5.0,
+                            eps: float = 0.5) -> Pose:
+        """
+        Poll the pose at 20 Hz until the arm reaches the target or stops moving
+
+        Args:
+            target: (x, y, z) the move was sent to, in mm
+            timeout: Maximum seconds to poll
+            eps: Distance in mm treated as "there" / "not moving"
+
+        Returns:
+            The last sampled pose
+        """
+        tx, ty, tz = target
+        deadline = time.monotonic() + timeout
+        previous = None
+        still = 0
+        while True:
+            self._invalidate_pose()
+            pose = self._read_pose()
+            if max(abs(pose.x - tx), abs(pose.y - ty), abs(pose.z - tz)) < eps:
+                return pose
+            if previous is not None and max(abs(pose.x - previous.x), abs(pose.y - previous.y),
+                                            abs(pose.z - previous.z)) < eps:
+                still += 1
+                if still >= 2:
+                    return pose
+            else:
+                still = 0
+            if not self.connected or time.monotonic() >= deadline:
+                return pose
+            previous = pose
+            time.sleep(0.05)
 
     def move_to(self, x: float, y: float, z: float, r: float = 0, wait: bool = True) -> bool:
         """
@@ -287,51 +538,220 @@ class DobotClient:
         Returns:
             True if command sent successfully, False otherwise
         """
-        if not self.connected or not self.device:
+        return self.move_to_future(x, y, z, r, wait=wait).result()
+
+    def move_to_future(self, x: float, y: float, z: float, r: float = 0, wait: bool = True) -> Future:
+        """
+        Submit a move to the move worker and return immediately
+
+        Args:
+            x: X coordinate in mm
+            y: Y coordinate in mm
+            z: Z coordinate in mm
+            r: Rotation in degrees
+            wait: The worker waits for the movement to complete before resolving the future
+
+        Returns:
+            Future resolving to move_to's result (moves run in submission order)
+        """
+        return self._move_io.submit(self._move_to, x, y, z, r, wait, self._move_generation)
+
+    async def move_to_async(self, x: float, y: float, z: float, r: float = 0, wait: bool = True) -> bool:
+        """
+        Awaitable move_to - the event loop is free while the robot moves
+
+        Args:
+            x: X coordinate in mm
+            y: Y coordinate in mm
+            z: Z coordinate in mm
+            r: Rotation in degrees
+            wait: Resolve once the movement has completed rather than once it is sent
+
+        Returns:
+            True if command sent successfully, False otherwise
+        """
+        return await asyncio.wrap_future(self.move_to_future(x, y, z, r, wait=wait))
+
+    def _cancel_pending_moves(self):
+        """Drop every move submitted so far that has not been sent to the robot yet"""
+        with self._move_lock:
+            self._move_generation += 1
+
+    def _send_move(self, x: float, y: float, z: float, r: float, generation: int) -> Optional[int]:
+        """
+        Queue one MOVL_XYZ move on the robot unless it was cancelled after being submitted
+
+        Args:
+            x: X coordinate in mm
+            y: Y coordinate in mm
+            z: Z coordinate in mm
+            r: Rotation in degrees
+            generation: _move_generation when the move was submitted
+
+        Returns:
+            Queued command index, or None if the move was cancelled
+        """
+        with self._move_lock:
+            if generation != self._move_generation:
+                self.last_error = "Move cancelled by emergency stop"
+                logger.warning("🛑 Skipping move to (%s, %s, %s, %s) - cancelled", x, y, z, r)
+                return None
+            response = self.device._set_ptp_cmd(x, y, z, r, mode=PTPMode.MOVL_XYZ, wait=False)
+        self._invalidate_pose()
+        # SET_PTP_CMD acknowledges with the 64-bit index the command got in the queue
+        return struct.unpack_from('<Q', response.params, 0)[0]
+
+    def _wait_for_index(self, index: int, generation: int, timeout: Optional[float] = None) -> bool:
+        """
+        Poll the queued command index until the robot has executed command `index`
+
+        Args:
+            index: Queued command index to wait for
+            generation: _move_generation of the moves being waited on
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True once the command has executed; False on timeout, emergency stop or disconnect
+            (a cleared queue never reaches the index, so pydobot's own wait would spin forever)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.device._get_queued_cmd_current_index() < index:
+            if generation != self._move_generation:
+                self.last_error = "Move cancelled by emergency stop"
+                return False
+            if not self.connected:
+                self.last_error = "Dobot disconnected during move"
+                return False
+            if deadline is not None and time.monotonic() > deadline:
+                self.last_error = f"Timed out waiting for queued moves after {timeout}s"
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _move_to(self, x: float, y: float, z: float, r: float, wait: bool, generation: int) -> bool:
+        """Body of move_to, run on the move worker thread"""
+        if not self.connected:
             self.last_error = "Dobot not connected"
             logger.error("❌ Dobot not connected")
             return False
 
         try:
-            logger.info(f"🤖 Executing move_to({x}, {y}, {z}, {r}, wait={wait})")
+            logger.info("🤖 Executing move_to(%s, %s, %s, %s, wait=%s)", x, y, z, r, wait)
 
-            # Get initial position
-            initial_pose = self.get_pose()
-            logger.info(f"📍 Initial position: X={initial_pose['x']:.2f}, Y={initial_pose['y']:.2f}, Z={initial_pose['z']:.2f}")
+            # The start/end position reads only feed the debug "did we move" check -
+            # pydobot's move_to(wait=True) already waits on the queued command index
+            verify = wait and logger.isEnabledFor(logging.DEBUG)
 
-            # Use direct move_to
-            self.device.move_to(x, y, z, r, wait=wait)
+            if verify:
+                # Get initial position
+                initial_pose = self._read_pose()
+                logger.debug("📍 Initial position: X=%.2f, Y=%.2f, Z=%.2f", initial_pose.x, initial_pose.y, initial_pose.z)
 
-            if wait:
-                # Small delay to let movement complete
-                time.sleep(0.2)
+            # Same MOVL_XYZ command pydobot's move_to sends, but cancellable until it is sent
+            index = self._send_move(x, y, z, r, generation)
+            if index is None or (wait and not self._wait_for_index(index, generation)):
+                return False
 
-                # Verify final position
-                final_pose = self.get_pose()
-                logger.info(f"📍 Final position: X={final_pose['x']:.2f}, Y={final_pose['y']:.2f}, Z={final_pose['z']:.2f}")
+            if verify:
+                # Verify final position once the arm has settled
+                final_pose = self._wait_until_settled((x, y, z))
+                logger.debug("📍 Final position: X=%.2f, Y=%.2f, Z=%.2f", final_pose.x, final_pose.y, final_pose.z)
 
                 # Check if we actually moved
-                distance_moved = (
-                    abs(final_pose['x'] - initial_pose['x']) +
-                    abs(final_pose['y'] - initial_pose['y']) +
-                    abs(final_pose['z'] - initial_pose['z'])
-                )
+                distance_moved = (abs(final_pose.x - initial_pose.x) + abs(final_pose.y - initial_pose.y)
+                                  + abs(final_pose.z - initial_pose.z))
 
                 if distance_moved > 1.0:
-                    logger.info(f"✅ Movement completed! Moved {distance_moved:.2f}mm total")
+                    logger.debug("✅ Movement completed! Moved %.2fmm total", distance_moved)
                 else:
-                    logger.warning(f"⚠️ Position barely changed ({distance_moved:.2f}mm). Robot may not be moving.")
+                    logger.warning("⚠️ Position barely changed (%.2fmm). Robot may not be moving.", distance_moved)
 
-            logger.info(f"✅ Move command {'completed' if wait else 'queued'}: ({x}, {y}, {z}, {r})")
+            logger.info("✅ Move command %s: (%s, %s, %s, %s)", 'completed' if wait else 'queued', x, y, z, r)
             return True
 
         except Exception as e:
             self.last_error = f"Error moving: {str(e)}"
+            logger.exception(f"❌ Move error: {self.last_error}")
+            return False
+
+    def move_to_queued(self, x: float, y: float, z: float, r: float = 0) -> Optional[int]:
+        """
+        Queue a move without waiting and return its queued command index
+        (same contract as the official-API client's move_to index)
+
+        Args:
+            x: X coordinate in mm
+            y: Y coordinate in mm
+            z: Z coordinate in mm
+            r: Rotation in degrees
+
+        Returns:
+            Queued command index, or None if the command could not be queued
+        """
+        return self._move_io.submit(self._move_to_queued, x, y, z, r, self._move_generation).result()
+
+    def _move_to_queued(self, x: float, y: float, z: float, r: float, generation: int) -> Optional[int]:
+        """Body of move_to_queued, run on the move worker thread"""
+        if not self.connected:
+            self.last_error = "Dobot not connected"
+            logger.error("❌ Dobot not connected")
+            return None
+
+        try:
+            index = self._send_move(x, y, z, r, generation)
+            if index is None:
+                return None
+            logger.info("✅ Move command queued with index %s: (%s, %s, %s, %s)", index, x, y, z, r)
+            return index
+
+        except Exception as e:
+            self.last_error = f"Error queueing move: {str(e)}"
             logger.error(f"❌ Move error: {self.last_error}")
-            import traceback
-            logger.error(traceback.format_exc())
+            return None
+
+    def move_to_batch(self, points: List[Tuple[float, float, float, float]], timeout: float = 30.0) -> bool:
+        """
+        Queue several moves back to back and wait once, on the last one.
+        Each move costs one enqueue instead of a full blocking wait per point.
+
+        Args:
+            points: (x, y, z, r) targets in mm / degrees, executed in order
+            timeout: Maximum seconds to wait for the last move to complete
+
+        Returns:
+            True if every move was queued and the last one completed, False otherwise
+            (if a point fails to queue, the points queued before it are cleared again)
+        """
+        if not points:
+            return True
+        return self._move_io.submit(self._move_to_batch, points, timeout, self._move_generation).result()
+
+    def _move_to_batch(self, points: List[Tuple[float, float, float, float]], timeout: float,
+                       generation: int) -> bool:
+        """Body of move_to_batch, run on the move worker thread"""
+        last_index = None
+        for queued, (x, y, z, r) in enumerate(points):
+            last_index = self._move_to_queued(x, y, z, r, generation)
+            if last_index is None:
+                if queued:
+                    # Don't leave the first part of a path running on its own
+                    logger.warning("⚠️ Batch stopped after %d of %d moves - clearing them", queued, len(points))
+                    self.clear_queue()
+                return False
+
+        logger.info("⏳ Waiting for %d queued moves (last index %s)...", len(points), last_index)
+        try:
+            if not self._wait_for_index(last_index, generation, timeout):
+                logger.warning(f"⚠️ {self.last_error}")
+                return False
+        except Exception as e:
+            self.last_error = f"Error waiting for queued moves: {str(e)}"
+            logger.error(f"❌ {self.last_error}")
             return False
 
+        logger.info("✅ Batch of %d moves completed", len(points))
+        return True
+
     def home(self, wait: bool = True) -> bool:
         """
         Move robot to home position
@@ -342,7 +762,7 @@ class DobotClient:
         Returns:
             True if command sent successfully, False otherwise
         """
-        logger.info(f"🏠 Moving to home position: {self.HOME_POSITION}")
+        logger.info("🏠 Moving to home position: %s", self.HOME_POSITION)
         return self.move_to(
             self.HOME_POSITION['x'],
             self.HOME_POSITION['y'],
@@ -359,7 +779,7 @@ class DobotClient:
             velocity_ratio: Velocity ratio 1-100%
             acceleration_ratio: Acceleration ratio 1-100%
         """
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
@@ -367,9 +787,9 @@ class DobotClient:
             self.acceleration_ratio = max(1, min(100, acceleration_ratio))
 
             # Use pydobot's speed method if available
-            if hasattr(self.device, 'speed'):
-                self.device.speed(self.velocity_ratio, self.acceleration_ratio)
-                logger.info(f"✅ Speed set: velocity={self.velocity_ratio}%, accel={self.acceleration_ratio}%")
+            if self._speed_fn:
+                self._speed_fn(self.velocity_ratio, self.acceleration_ratio)
+                logger.info("✅ Speed set: velocity=%s%%, accel=%s%%", self.velocity_ratio, self.acceleration_ratio)
             else:
                 logger.warning("⚠️ Speed setting not available in this pydobot version")
 
@@ -378,12 +798,12 @@ class DobotClient:
 
     def start_queue(self):
         """Start executing the command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
-            if hasattr(self.device, 'start_queue'):
-                self.device.start_queue()
+            if self._start_queue_fn:
+                self._start_queue_fn()
                 logger.info("✅ Command queue started")
             else:
                 logger.debug("start_queue method not available")
@@ -392,12 +812,12 @@ class DobotClient:
 
     def stop_queue(self):
         """Stop executing the command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
-            if hasattr(self.device, 'stop_queue'):
-                self.device.stop_queue()
+            if self._stop_queue_fn:
+                self._stop_queue_fn()
                 logger.info("Command queue stopped")
             else:
                 self.clear_queue()
@@ -406,23 +826,25 @@ class DobotClient:
 
     def clear_queue(self):
         """Clear command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
             self.device.clear_command_queue()
+            self._invalidate_pose()
             logger.info("Command queue cleared")
         except Exception as e:
             logger.error(f"Error clearing queue: {e}")
 
     def set_suction(self, enable: bool):
         """Enable/disable suction cup"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
             self.device.suck(enable)
-            logger.info(f"💨 Suction cup {'enabled' if enable else 'disabled'}")
+            self._invalidate_pose()
+            logger.info("💨 Suction cup %s", 'enabled' if enable else 'disabled')
         except Exception as e:
             logger.error(f"❌ Error setting suction: {e}")
 
@@ -433,7 +855,7 @@ class DobotClient:
         Args:
             open_gripper: True to open, False to close
         """
-        if not self.connected or not self.device:
+        if not self.connected:
             logger.error("❌ Dobot not connected")
             return
 
@@ -442,13 +864,16 @@ class DobotClient:
             # grip() method: True = grip (close), False = release (open)
             # So we need to invert the logic: open_gripper=True means grip=False
             self.device.grip(not open_gripper)
-            logger.info(f"✋ Gripper {'opened' if open_gripper else 'closed'}")
+            self._invalidate_pose()
+            logger.info("✋ Gripper %s", 'opened' if open_gripper else 'closed')
         except Exception as e:
             logger.error(f"❌ Error controlling gripper: {e}")
 
     def emergency_stop(self):
-        """Emergency stop - clears queue"""
-        if not self.connected or not self.device:
+        """Emergency stop - cancels moves not yet sent, then clears queue"""
+        # Before the clear, so a move waiting on the worker can't be sent after it
+        self._cancel_pending_moves()
+        if not self.connected:
             return
 
         try:
@@ -457,11 +882,64 @@ class DobotClient:
         except Exception as e:
             logger.error(f"❌ Error during emergency stop: {e}")
 
+    @staticmethod
+    def _load_last_port() -> Optional[str]:
+        """Read the last port a Dobot connected on, if saved"""
+        try:
+            with open(LAST_PORT_FILE, 'r') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _save_last_port(port: str):
+        """Remember the port a Dobot connected on for the next connect()"""
+        try:
+            with open(LAST_PORT_FILE, 'w') as f:
+                f.write(port)
+        except OSError as e:
+            logger.debug(f"Could not save last Dobot port: {e}")
+
     @staticmethod
     def find_dobot_ports() -> List[str]:
-        """Find all potential Dobot USB ports"""
-        import glob
-        ports = []
-        ports.extend(glob.glob('/dev/ttyACM*'))
-        ports.extend(glob.glob('/dev/ttyUSB*'))
+        """
+        Find all potential Dobot USB ports.
+        With pyserial's port list, serial devices whose USB vendor can't be a Dobot's USB-serial
+        bridge are left out, so no handshake timeout is spent on them.
+        The result is reused for PORT_CACHE_TTL seconds unless a device node was added or removed.
+        """
+        try:
+            dev_mtime = os.stat('/dev').st_mtime_ns
+        except OSError:
+            dev_mtime = None
+        now = time.monotonic()
+        if (_PORT_CACHE['ports'] is not None and dev_mtime == _PORT_CACHE['dev_mtime']
+                and now - _PORT_CACHE['ts'] < PORT_CACHE_TTL):
+            return list(_PORT_CACHE['ports'])
+
+        ports = DobotClient._scan_dobot_ports()
+        _PORT_CACHE.update(ts=now, dev_mtime=dev_mtime, ports=ports)
+        return list(ports)
+
+    @staticmethod
+    def _scan_dobot_ports() -> List[str]:
+        """Enumerate candidate Dobot ports (uncached, see find_dobot_ports)"""
+        if _load_pydobot():
+            ports = []
+            for info in list_ports.comports():
+                if not info.device.startswith(('/dev/ttyACM', '/dev/ttyUSB')):
+                    continue
+                if (info.vid is not None and info.vid not in DOBOT_USB_VIDS
+                        and 'Dobot' not in (info.description or '')):
+                    logger.debug(f"Skipping {info.device} (USB vendor {info.vid:04x} is not a Dobot bridge)")
+                    continue
+                ports.append(info.device)
+            return sorted(ports)
+
+        # One pass over /dev for both name patterns
+        try:
+            with os.scandir('/dev') as entries:
+                ports = [entry.path for entry in entries if entry.name.startswith(('ttyACM', 'ttyUSB'))]
+        except OSError:
+            return []
         return sorted(ports)
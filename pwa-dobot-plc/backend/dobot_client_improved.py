@@ -4,8 +4,11 @@ Uses pydobot with proper parameter initialization and queue management
 """
 
 import logging
+import os
+import select
+import threading
 import time
-from typing import Dict, Optional, List
+from typing import Dict, NamedTuple, Optional, List, Tuple
 import struct
 
 logger = logging.getLogger(__name__)
@@ -13,6 +16,10 @@ logger = logging.getLogger(__name__)
 # Try to import pydobot
 try:
     from pydobot import Dobot as PyDobot
+    from pydobot.message import Message
+    from pydobot.enums import PTPMode
+    from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
+    from pydobot.enums.ControlValues import ControlValues
     from serial.tools import list_ports
     import serial
     DOBOT_AVAILABLE = True
@@ -20,6 +27,64 @@ except ImportError:
     DOBOT_AVAILABLE = False
     logger.warning("pydobot not installed - Dobot functionality disabled")
 
+# USB-serial bridges used on Dobot controllers: Silicon Labs CP210x, QinHeng CH340
+DOBOT_USB_VIDS = {0x10C4, 0x1A86}
+
+
+class Pose(NamedTuple):
+    """Robot position - x, y, z in mm, r in degrees"""
+    x: float
+    y: float
+    z: float
+    r: float
+
+
+# Returned when there is no connection or the pose read fails
+ZERO_POSE = Pose(0.0, 0.0, 0.0, 0.0)
+
+# Message params, packed once: RESET_POSE payload and the SET_PTP_CMD mode + x, y, z, r layout
+_RESET_POSE_PARAMS = bytes((0x01, 0x00, 0x00, 0x00))
+_PTP_PACK = struct.Struct('<Bffff').pack
+_PTP_TARGET_INTO = struct.Struct('<ffff').pack_into
+# SET_PTP_CMD acknowledges with the 64-bit queued command index
+_QUEUED_INDEX = struct.Struct('<Q')
+# GET_POSE answers with x, y, z, r and the four joint angles
+_POSE_FLOATS = struct.Struct('<8f')
+
+
+def _encode(protocol_id: int, ctrl: int, params: bytes = b'') -> bytes:
+    """Encode a pydobot protocol message to the bytes written to the serial port"""
+    msg = Message()
+    msg.id = protocol_id
+    msg.ctrl = ctrl
+    msg.params = bytearray(params)
+    return bytes(msg.bytes())
+
+
+# Fixed messages, encoded once at import
+if DOBOT_AVAILABLE:
+    _CLEAR_ALARM_BYTES = _encode(CommunicationProtocolIDs.CLEAR_ALL_ALARMS_STATE, ControlValues.ONE)
+    # Same protocol id as the clear, read with ctrl 0
+    _GET_ALARMS_BYTES = _encode(CommunicationProtocolIDs.CLEAR_ALL_ALARMS_STATE, ControlValues.ZERO)
+    _RESET_POSE_BYTES = _encode(CommunicationProtocolIDs.RESET_POSE, ControlValues.ZERO, _RESET_POSE_PARAMS)
+    _GET_POSE_BYTES = _encode(CommunicationProtocolIDs.GET_POSE, ControlValues.ZERO)
+    # SET_PTP_CMD with a zero target; _ptp_frame() fills in the real one. MOVL_XYZ is the
+    # straight-line move pydobot's move_to uses
+    _PTP_TEMPLATE = _encode(CommunicationProtocolIDs.SET_PTP_CMD, ControlValues.THREE,
+                            _PTP_PACK(PTPMode.MOVL_XYZ, 0.0, 0.0, 0.0, 0.0))
+
+
+def _ptp_frame(x: float, y: float, z: float, r: float) -> bytearray:
+    """
+    Encoded SET_PTP_CMD frame for a target - the prebuilt template with x, y, z, r packed in place
+    (header 0xAA 0xAA, length, id, ctrl, mode byte, then the floats) and the checksum redone
+    """
+    frame = bytearray(_PTP_TEMPLATE)
+    _PTP_TARGET_INTO(frame, 6, x, y, z, r)
+    # Checksum: two's complement of the id + ctrl + params byte sum
+    frame[-1] = -sum(frame[3:-1]) & 0xFF
+    return frame
+
 class DobotClient:
     """Dobot Robot Communication Client using Improved pydobot"""
 
@@ -42,25 +107,53 @@ class DobotClient:
     PROTOCOL_QUEUE_STOP = 241  # Stop queue execution
     PROTOCOL_QUEUE_CLEAR = 245  # Clear queue
 
-    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0'):
+    # How often the alarm watchdog checks the robot's alarm state
+    ALARM_WATCHDOG_PERIOD = 1.0  # seconds
+
+    # Pose reads younger than this are answered from cache (frontend status polling)
+    POSE_CACHE_TTL = 0.05  # seconds
+
+    # Longest wait for a move to finish executing with move_to(wait=True)
+    MOVE_TIMEOUT = 30.0  # seconds
+
+    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0', low_latency: bool = True):
         """
         Initialize Dobot client with improved pydobot
 
         Args:
             use_usb: Use USB connection (True) or skip Dobot entirely (False)
             usb_path: USB device path for Dobot
+            low_latency: Switch the serial port to low-latency mode after opening it
         """
         self.use_usb = use_usb
         self.usb_path = usb_path
+        self.low_latency = low_latency
+        # connected implies device is set, so public methods only check connected
         self.connected = False
         self.last_error = ""
         self.device = None
         self.actual_port = None
+        # Optional pydobot methods, bound by _bind_device_methods()
+        self._speed_fn = None
+        self._start_queue_fn = None
+        self._stop_queue_fn = None
 
         # Movement parameters
         self.velocity_ratio = self.DEFAULT_VELOCITY_RATIO
         self.acceleration_ratio = self.DEFAULT_ACCELERATION_RATIO
 
+        # Last pose read, reused for POSE_CACHE_TTL seconds
+        self._pose_cache: Optional[Pose] = None
+        self._pose_time = 0.0
+
+        # Background thread that clears alarms as they are raised (see _alarm_watchdog_loop)
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._watchdog_stop = threading.Event()
+
+        # Set when a move fails, after an emergency stop, or when an alarm won't clear -
+        # the next move reconnects and resets the robot first
+        self._needs_reset = False
+
     def connect(self) -> bool:
         """Connect to Dobot robot with improved initialization"""
         if not self.use_usb or not DOBOT_AVAILABLE:
@@ -100,9 +193,7 @@ class DobotClient:
 
         except Exception as e:
             self.last_error = f"Connection error: {str(e)}"
-            logger.error(f"❌ {self.last_error}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ {self.last_error}")
             return False
 
     def _try_connect(self, port: str) -> bool:
@@ -110,6 +201,8 @@ class DobotClient:
         try:
             logger.info(f"Trying to connect to Dobot on {port}...")
             self.device = PyDobot(port=port, verbose=False)
+            if self.low_latency:
+                self._enable_low_latency(self.device, port)
             self.connected = True
             self.actual_port = port
             logger.info(f"✅ Connected to Dobot on {port}")
@@ -118,28 +211,55 @@ class DobotClient:
             logger.debug(f"Port {port} failed: {e}")
             return False
 
-    def _initialize_robot(self):
-        """Initialize robot parameters - CRITICAL for movement to work"""
-        if not self.device:
+    @staticmethod
+    def _enable_low_latency(device, port: str):
+        """
+        Ask the serial driver to deliver responses immediately instead of after its latency timer
+        (16 ms by default on USB-serial bridges) - every pose read and move ack waits on it
+        """
+        try:
+            device.ser.set_low_latency_mode(True)
+            logger.info(f"⚡ Low-latency serial mode enabled on {port}")
             return
+        except Exception as e:  # Not Linux, old pyserial, or the driver rejects ASYNC_LOW_LATENCY
+            logger.debug(f"set_low_latency_mode failed on {port}: {e}")
+
+        # usb-serial drivers (FTDI etc.) expose the timer in sysfs; needs write access
+        timer_path = f"/sys/bus/usb-serial/devices/{os.path.basename(os.path.realpath(port))}/latency_timer"
+        try:
+            with open(timer_path, 'w') as f:
+                f.write('1')
+            logger.info(f"⚡ Serial latency timer set to 1 ms ({timer_path})")
+        except OSError as e:
+            logger.debug(f"Could not set serial latency timer: {e}")
+
+    def _bind_device_methods(self):
+        """Look up the optional pydobot methods once per device (not every pydobot version has them)"""
+        self._speed_fn = getattr(self.device, 'speed', None)
+        self._start_queue_fn = getattr(self.device, 'start_queue', None)
+        self._stop_queue_fn = getattr(self.device, 'stop_queue', None)
+
+    def _initialize_robot(self) -> bool:
+        """
+        Initialize robot parameters - CRITICAL for movement to work
+
+        Returns:
+            True if the alarm clear and pose reset were acknowledged, False otherwise
+            (_needs_reset then stays set, so the next move tries again)
+        """
+        if not self.device:
+            return False
+
+        self._bind_device_methods()
+        cleared = False
 
         try:
             logger.info("🔧 Initializing robot parameters...")
 
-            # CRITICAL: Clear all alarms first!
+            # CRITICAL: Clear all alarms first and reset the pose - done once per connection,
+            # not before every move
             # This was the issue preventing movement
-            try:
-                from pydobot.message import Message
-                from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
-                from pydobot.enums.ControlValues import ControlValues
-
-                msg = Message()
-                msg.id = CommunicationProtocolIDs.CLEAR_ALL_ALARMS_STATE
-                msg.ctrl = ControlValues.ONE
-                self.device._send_command(msg)
-                logger.info("✅ Cleared all alarms")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not clear alarms: {e}")
+            cleared = self._clear_alarms(reset_pose=True)
 
             # Clear any existing queue
             try:
@@ -151,19 +271,202 @@ class DobotClient:
             # Set speed parameters
             self.set_speed(self.velocity_ratio, self.acceleration_ratio)
 
-            # Give the robot a moment to process
-            time.sleep(0.1)
+            self._needs_reset = not cleared
+            self._start_alarm_watchdog()
+            if cleared:
+                logger.info("✅ Robot initialized successfully")
+            else:
+                logger.warning("⚠️ Robot initialized, but alarms may still be set - will reset before the next move")
 
-            logger.info("✅ Robot initialized successfully")
+        except Exception as e:
+            self._needs_reset = True
+            logger.exception(f"❌ Error initializing robot: {e}")
+        return cleared
 
+    def _clear_alarms(self, reset_pose: bool = False) -> bool:
+        """
+        Clear all alarm states, optionally resetting the pose as well (one serial write)
+
+        Args:
+            reset_pose: Also send RESET_POSE (needed after (re)connecting)
+
+        Returns:
+            True if the commands were acknowledged, False otherwise
+        """
+        try:
+            packets = [_CLEAR_ALARM_BYTES]
+            if reset_pose:
+                # Reset pose (CRITICAL!)
+                packets.append(_RESET_POSE_BYTES)
+            if None in self._send_batch(packets):
+                logger.warning("⚠️ Alarm clear was not acknowledged")
+                return False
+            logger.info(f"✅ Cleared all alarms{' and reset pose' if reset_pose else ''}")
+            return True
         except Exception as e:
-            logger.error(f"❌ Error initializing robot: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.warning(f"⚠️ Could not clear alarms: {e}")
+            return False
+
+    def _send_batch(self, packets: List[bytes], timeout: float = 1.0) -> List[Optional['Message']]:
+        """
+        Write several protocol messages in one serial write, then collect their acknowledgements.
+        pydobot's _send_command writes one message and sleeps before reading each reply.
+
+        Args:
+            packets: Encoded messages to send, in order
+            timeout: Maximum seconds to wait for all acknowledgements
+
+        Returns:
+            One response per message, in order (None for any that did not arrive in time).
+            Replies are matched to requests by protocol id, so a stray or late frame can't
+            shift the ones after it.
+        """
+        ser = self.device.ser
+        # Protocol id of each request (byte 3 after the 0xAA 0xAA header and length)
+        pending = [packet[3] for packet in packets]
+        responses: List[Optional['Message']] = [None] * len(packets)
+        missing = len(packets)
+        # Same lock pydobot holds around its own write/read pairs
+        with self.device.lock:
+            # Drop anything left over (e.g. an ack that arrived after an earlier timeout)
+            ser.reset_input_buffer()
+            ser.write(b''.join(packets))
+            data = bytearray()
+            deadline = time.monotonic() + timeout
+            while missing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                waiting = ser.in_waiting
+                if not waiting:
+                    self._wait_readable(ser, remaining)
+                    continue
+                data.extend(ser.read(waiting))
+                received, data = self._split_packets(data)
+                for packet in received:
+                    try:
+                        slot = pending.index(packet[3])
+                    except ValueError:
+                        logger.debug(f"Ignoring unexpected Dobot reply (id {packet[3]})")
+                        continue
+                    pending[slot] = None
+                    responses[slot] = Message(packet)
+                    missing -= 1
+        return responses
+
+    @staticmethod
+    def _wait_readable(ser, timeout: float):
+        """Block until the serial port has data (or timeout) instead of spinning on in_waiting"""
+        try:
+            select.select([ser.fileno()], [], [], timeout)
+        except (AttributeError, OSError, ValueError):
+            # No pollable file descriptor (non-POSIX or non-tty port object)
+            time.sleep(0.001)
+
+    @staticmethod
+    def _split_packets(data: bytearray):
+        """
+        Split received bytes into complete protocol packets (0xAA 0xAA, length, payload, checksum)
+
+        Returns:
+            (list of packet bytes, unconsumed tail of data)
+        """
+        packets = []
+        start = 0
+        while True:
+            start = data.find(b'\xaa\xaa', start)
+            if start < 0:
+                # Keep a trailing 0xAA - it may be the first half of the next header
+                return packets, bytearray(data[-1:]) if data.endswith(b'\xaa') else bytearray()
+            if len(data) - start < 3:
+                return packets, data[start:]
+            end = start + 4 + data[start + 2]
+            if end > len(data):
+                return packets, data[start:]
+            packets.append(bytes(data[start:end]))
+            start = end
+
+    def _wait_for_index(self, index: int):
+        """Wait until the robot's queue has executed the command with this queued index"""
+        deadline = time.monotonic() + self.MOVE_TIMEOUT
+        while self.device._get_queued_cmd_current_index() < index:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Move did not complete within {self.MOVE_TIMEOUT}s")
+            time.sleep(0.05)
+
+    def _start_alarm_watchdog(self):
+        """Start the alarm watchdog thread if it is not already running"""
+        if (self._watchdog_thread is not None and self._watchdog_thread.is_alive()
+                and not self._watchdog_stop.is_set()):
+            return
+        # Fresh event per thread, so a stopping thread that has not exited yet can't be revived
+        # or leave the new one without a watchdog
+        self._watchdog_stop = threading.Event()
+        self._watchdog_thread = threading.Thread(target=self._alarm_watchdog_loop, args=(self._watchdog_stop,),
+                                                 name='dobot-alarm-watchdog', daemon=True)
+        self._watchdog_thread.start()
+
+    def _stop_alarm_watchdog(self):
+        """Stop the alarm watchdog thread and wait for it to exit"""
+        self._watchdog_stop.set()
+        thread = self._watchdog_thread
+        if thread is not None and thread is not threading.current_thread():
+            # Covers one in-flight alarm check (serial timeout included)
+            thread.join(timeout=self.ALARM_WATCHDOG_PERIOD + 2.0)
+        self._watchdog_thread = None
+
+    def _alarm_watchdog_loop(self, stop: threading.Event):
+        """
+        Poll the alarm state every ALARM_WATCHDOG_PERIOD seconds and clear it only when an alarm
+        is set, so the connection can stay open between moves instead of being reset
+
+        Args:
+            stop: Event that ends this thread when set
+        """
+        while not stop.wait(self.ALARM_WATCHDOG_PERIOD):
+            if not self.connected or self._needs_reset:
+                continue
+            try:
+                state, = self._send_batch([_GET_ALARMS_BYTES])
+                if state is not None and any(state.params):
+                    logger.warning("⚠️ Alarm raised on Dobot - clearing")
+                    if not self._clear_alarms():
+                        # Leave it to the full reset before the next move
+                        self._needs_reset = True
+            except Exception as e:
+                # The port may be mid-reconnect; try again next period
+                logger.debug(f"Alarm watchdog check failed: {e}")
+
+    def _recover(self) -> bool:
+        """Reopen the serial connection and re-initialize the robot after a failed move"""
+        logger.info("🔄 Reconnecting after failed move...")
+        try:
+            self.device.close()
+        except:
+            pass
+
+        try:
+            time.sleep(0.5)  # Wait for port to be fully released
+            self.device = PyDobot(port=self.actual_port, verbose=False)
+            if self.low_latency:
+                self._enable_low_latency(self.device, self.actual_port)
+            logger.info("✅ Reconnected")
+        except Exception as e:
+            self.last_error = f"Error reconnecting: {str(e)}"
+            logger.error(f"❌ {self.last_error}")
+            self.connected = False
+            return False
+
+        if not self._initialize_robot():
+            self.last_error = "Reconnected, but the robot did not acknowledge the alarm clear / pose reset"
+            logger.error(f"❌ {self.last_error}")
+            return False
+        return True
 
     def disconnect(self):
         """Disconnect from Dobot"""
-        if self.connected and self.device:
+        self._stop_alarm_watchdog()
+        if self.connected:
             try:
                 self.device.close()
                 self.connected = False
@@ -173,23 +476,67 @@ class DobotClient:
                 logger.error(f"❌ Error disconnecting from Dobot: {e}")
 
     def get_pose(self) -> Dict[str, float]:
-        """Get current robot position"""
-        if not self.connected or not self.device:
-            return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'r': 0.0}
+        """Get current robot position (cached for POSE_CACHE_TTL seconds)"""
+        return self._read_pose()._asdict()
+
+    def _read_pose(self) -> Pose:
+        """get_pose without the dict conversion - used internally by move_to"""
+        if not self.connected:
+            return ZERO_POSE
+
+        cached = self._pose_cache
+        if cached is not None and time.monotonic() - self._pose_time < self.POSE_CACHE_TTL:
+            return cached
 
         try:
             # pydobot.pose() returns tuple: (x, y, z, r, j1, j2, j3, j4)
             pose = self.device.pose()
-            return {
-                'x': float(pose[0]),
-                'y': float(pose[1]),
-                'z': float(pose[2]),
-                'r': float(pose[3])
-            }
+            result = Pose(float(pose[0]), float(pose[1]), float(pose[2]), float(pose[3]))
+            self._pose_time = time.monotonic()
+            self._pose_cache = result
+            return result
         except Exception as e:
             self.last_error = f"Error getting pose: {str(e)}"
             logger.error(self.last_error)
-            return {'x': 0.0, 'y': 0.0, 'z': 0.0, 'r': 0.0}
+            return ZERO_POSE
+
+    def _wait_until_settled(self, target: Tuple[float, float, float], timeout: float = 5.0,
+                            eps: float = 0.5) -> Pose:
+        """
+        Poll the pose at 20 Hz until the arm reaches the target or stops moving
+
+        Args:
+            target: (x, y, z) the move was sent to, in mm
+            timeout: Maximum seconds to poll
+            eps: Distance in mm treated as "there" / "not moving"
+
+        Returns:
+            The last sampled pose
+        """
+        tx, ty, tz = target
+        deadline = time.monotonic() + timeout
+        previous = None
+        still = 0
+        while True:
+            self._invalidate_pose()
+            pose = self._read_pose()
+            if max(abs(pose.x - tx), abs(pose.y - ty), abs(pose.z - tz)) < eps:
+                return pose
+            if previous is not None and max(abs(pose.x - previous.x), abs(pose.y - previous.y),
+                                            abs(pose.z - previous.z)) < eps:
+                still += 1
+                if still >= 2:
+                    return pose
+            else:
+                still = 0
+            if not self.connected or time.monotonic() >= deadline:
+                return pose
+            previous = pose
+            time.sleep(0.05)
+
+    def _invalidate_pose(self):
+        """Drop the cached pose once the robot has been told to move"""
+        self._pose_cache = None
 
     def move_to(self, x: float, y: float, z: float, r: float = 0, wait: bool = True) -> bool:
         """
@@ -205,91 +552,64 @@ class DobotClient:
         Returns:
             True if command sent successfully, False otherwise
         """
-        if not self.connected or not self.device:
+        if not self.connected:
             self.last_error = "Dobot not connected"
             logger.error("❌ Dobot not connected")
             return False
 
         try:
-            logger.info(f"🤖 Executing move_to({x}, {y}, {z}, {r}, wait={wait})")
+            logger.info("🤖 Executing move_to(%s, %s, %s, %s, wait=%s)", x, y, z, r, wait)
 
-            # WORKAROUND: Recreate connection for EACH movement (like the working test)
-            # This is the ONLY way I could get it to work consistently
-            logger.info("🔄 Reconnecting for movement...")
-            old_device = self.device
-            old_port = self.actual_port
+            # Heavy recovery (reconnect, clear alarms, reset pose) only after a failed move;
+            # otherwise the connection set up by connect() is reused as-is
+            if self._needs_reset and not self._recover():
+                return False
 
-            try:
-                old_device.close()
-            except:
-                pass
+            # The start/end position reads only feed the debug "did we move" check -
+            # the move itself is confirmed by the queued command index
+            verify = wait and logger.isEnabledFor(logging.DEBUG)
 
-            # Create fresh connection
-            time.sleep(0.5)  # Wait for port to be fully released
-            self.device = PyDobot(port=old_port, verbose=False)
-            logger.info("✅ Reconnected")
-            time.sleep(0.5)  # Wait for new connection to stabilize
-
-            # CRITICAL: Clear alarms AND reset pose
+            # Fast path: clearing any alarm raised since the last move, reading the starting
+            # position (debug only) and the PTP command go out in one serial write
             try:
-                from pydobot.message import Message
-                from pydobot.enums.CommunicationProtocolIDs import CommunicationProtocolIDs
-                from pydobot.enums.ControlValues import ControlValues
-
-                # Clear alarms
-                msg = Message()
-                msg.id = CommunicationProtocolIDs.CLEAR_ALL_ALARMS_STATE
-                msg.ctrl = ControlValues.ONE
-                self.device._send_command(msg)
-                logger.info("✅ Cleared alarms")
-
-                # Reset pose (CRITICAL!)
-                msg = Message()
-                msg.id = CommunicationProtocolIDs.RESET_POSE
-                msg.ctrl = ControlValues.ZERO
-                msg.params = bytearray([0x01, 0x00, 0x00, 0x00])
-                self.device._send_command(msg)
-                logger.info("✅ Reset pose")
-
-                time.sleep(0.5)  # Brief pause after reset
-            except Exception as e:
-                logger.warning(f"⚠️ Could not reset before movement: {e}")
-
-            # Get initial position
-            initial_pose = self.get_pose()
-            logger.info(f"📍 Initial position: X={initial_pose['x']:.2f}, Y={initial_pose['y']:.2f}, Z={initial_pose['z']:.2f}")
-
-            # Use direct move_to like the test
-            self.device.move_to(x, y, z, r, wait=wait)
-
-            if wait:
-                # Small delay to let movement complete
-                time.sleep(0.2)
-
-                # Verify final position
-                final_pose = self.get_pose()
-                logger.info(f"📍 Final position: X={final_pose['x']:.2f}, Y={final_pose['y']:.2f}, Z={final_pose['z']:.2f}")
+                packets = [_CLEAR_ALARM_BYTES, _ptp_frame(x, y, z, r)]
+                if verify:
+                    packets.insert(1, _GET_POSE_BYTES)
+                replies = self._send_batch(packets)
+                ack = replies[-1]
+                self._invalidate_pose()
+                if ack is None:
+                    raise IOError("Move command was not acknowledged")
+                initial_pose = None
+                if verify and replies[1] is not None:
+                    initial_pose = Pose(*_POSE_FLOATS.unpack_from(bytes(replies[1].params), 0)[:4])
+                    logger.debug("📍 Initial position: X=%.2f, Y=%.2f, Z=%.2f", initial_pose.x, initial_pose.y, initial_pose.z)
+                if wait:
+                    self._wait_for_index(_QUEUED_INDEX.unpack_from(bytes(ack.params), 0)[0])
+            except Exception:
+                self._needs_reset = True
+                raise
+
+            if initial_pose is not None:
+                # Verify final position once the arm has settled
+                final_pose = self._wait_until_settled((x, y, z))
+                logger.debug("📍 Final position: X=%.2f, Y=%.2f, Z=%.2f", final_pose.x, final_pose.y, final_pose.z)
 
                 # Check if we actually moved
-                distance_moved = (
-                    abs(final_pose['x'] - initial_pose['x']) +
-                    abs(final_pose['y'] - initial_pose['y']) +
-                    abs(final_pose['z'] - initial_pose['z'])
-                )
+                distance_moved = (abs(final_pose.x - initial_pose.x) + abs(final_pose.y - initial_pose.y)
+                                  + abs(final_pose.z - initial_pose.z))
 
                 if distance_moved > 1.0:
-                    logger.info(f"✅ Movement completed! Moved {distance_moved:.2f}mm total")
+                    logger.debug("✅ Movement completed! Moved %.2fmm total", distance_moved)
                 else:
-                    logger.warning(f"⚠️ Position barely changed ({distance_moved:.2f}mm). Robot may not be moving.")
+                    logger.warning("⚠️ Position barely changed (%.2fmm). Robot may not be moving.", distance_moved)
 
-            logger.info(f"✅ Move command {'completed' if wait else 'queued'}: ({x}, {y}, {z}, {r})")
+            logger.info("✅ Move command %s: (%s, %s, %s, %s)", 'completed' if wait else 'queued', x, y, z, r)
             return True
 
         except Exception as e:
             self.last_error = f"Error moving: {str(e)}"
-            logger.error(f"❌ Move error: {self.last_error}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Move error: {self.last_error}")
             return False
 
     def home(self, wait: bool = True) -> bool:
@@ -302,7 +622,7 @@ class DobotClient:
         Returns:
             True if command sent successfully, False otherwise
         """
-        logger.info(f"🏠 Moving to home position: {self.HOME_POSITION}")
+        logger.info("🏠 Moving to home position: %s", self.HOME_POSITION)
         return self.move_to(
             self.HOME_POSITION['x'],
             self.HOME_POSITION['y'],
@@ -319,7 +639,7 @@ class DobotClient:
             velocity_ratio: Velocity ratio 1-100%
             acceleration_ratio: Acceleration ratio 1-100%
         """
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
@@ -327,9 +647,9 @@ class DobotClient:
             self.acceleration_ratio = max(1, min(100, acceleration_ratio))
 
             # Use pydobot's speed method if available
-            if hasattr(self.device, 'speed'):
-                self.device.speed(self.velocity_ratio, self.acceleration_ratio)
-                logger.info(f"✅ Speed set: velocity={self.velocity_ratio}%, accel={self.acceleration_ratio}%")
+            if self._speed_fn:
+                self._speed_fn(self.velocity_ratio, self.acceleration_ratio)
+                logger.info("✅ Speed set: velocity=%s%%, accel=%s%%", self.velocity_ratio, self.acceleration_ratio)
             else:
                 logger.warning("⚠️ Speed setting not available in this pydobot version")
 
@@ -338,12 +658,12 @@ class DobotClient:
 
     def start_queue(self):
         """Start executing the command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
-            if hasattr(self.device, 'start_queue'):
-                self.device.start_queue()
+            if self._start_queue_fn:
+                self._start_queue_fn()
                 logger.info("✅ Command queue started")
             else:
                 logger.debug("start_queue method not available")
@@ -352,12 +672,12 @@ class DobotClient:
 
     def stop_queue(self):
         """Stop executing the command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
-            if hasattr(self.device, 'stop_queue'):
-                self.device.stop_queue()
+            if self._stop_queue_fn:
+                self._stop_queue_fn()
                 logger.info("Command queue stopped")
             else:
                 self.clear_queue()
@@ -366,23 +686,25 @@ class DobotClient:
 
     def clear_queue(self):
         """Clear command queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
             self.device.clear_command_queue()
+            self._invalidate_pose()
             logger.info("Command queue cleared")
         except Exception as e:
             logger.error(f"Error clearing queue: {e}")
 
     def set_suction(self, enable: bool):
         """Enable/disable suction cup"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
             self.device.suck(enable)
-            logger.info(f"💨 Suction cup {'enabled' if enable else 'disabled'}")
+            self._invalidate_pose()
+            logger.info("💨 Suction cup %s", 'enabled' if enable else 'disabled')
         except Exception as e:
             logger.error(f"❌ Error setting suction: {e}")
 
@@ -393,7 +715,7 @@ class DobotClient:
         Args:
             open_gripper: True to open, False to close
         """
-        if not self.connected or not self.device:
+        if not self.connected:
             logger.error("❌ Dobot not connected")
             return
 
@@ -402,26 +724,47 @@ class DobotClient:
             # grip() method: True = grip (close), False = release (open)
             # So we need to invert the logic: open_gripper=True means grip=False
             self.device.grip(not open_gripper)
-            logger.info(f"✋ Gripper {'opened' if open_gripper else 'closed'}")
+            self._invalidate_pose()
+            logger.info("✋ Gripper %s", 'opened' if open_gripper else 'closed')
         except Exception as e:
             logger.error(f"❌ Error controlling gripper: {e}")
 
     def emergency_stop(self):
         """Emergency stop - clears queue"""
-        if not self.connected or not self.device:
+        if not self.connected:
             return
 
         try:
             self.clear_queue()
+            # Start the next move from a clean state (alarms cleared, pose reset)
+            self._needs_reset = True
             logger.warning("🛑 EMERGENCY STOP executed")
         except Exception as e:
             logger.error(f"❌ Error during emergency stop: {e}")
 
     @staticmethod
     def find_dobot_ports() -> List[str]:
-        """Find all potential Dobot USB ports"""
-        import glob
-        ports = []
-        ports.extend(glob.glob('/dev/ttyACM*'))
-        ports.extend(glob.glob('/dev/ttyUSB*'))
+        """
+        Find all potential Dobot USB ports.
+        Serial devices whose USB vendor can't be a Dobot's USB-serial bridge (Bluetooth, modems)
+        are left out, so connect() never opens them.
+        """
+        if DOBOT_AVAILABLE:
+            ports = []
+            for info in list_ports.comports():
+                if not info.device.startswith(('/dev/ttyACM', '/dev/ttyUSB')):
+                    continue
+                if (info.vid is not None and info.vid not in DOBOT_USB_VIDS
+                        and 'Dobot' not in (info.description or '')):
+                    logger.debug(f"Skipping {info.device} (USB vendor {info.vid:04x} is not a Dobot bridge)")
+                    continue
+                ports.append(info.device)
+            return sorted(ports)
+
+        # One pass over /dev for both name patterns
+        try:
+            with os.scandir('/dev') as entries:
+                ports = [entry.path for entry in entries if entry.name.startswith(('ttyACM', 'ttyUSB'))]
+        except OSError:
+            return []
         return sorted(ports)
@@ -43,16 +43,25 @@ class DobotClient:
     DEFAULT_VELOCITY_RATIO = 100  # 1-100%
     DEFAULT_ACCELERATION_RATIO = 100  # 1-100%
 
-    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0'):
+    # Completion polling for move_to(wait=True): the delay starts short for quick moves and
+    # backs off so long moves don't flood the serial link with index queries
+    POLL_DELAY_MIN_MS = 10
+    POLL_DELAY_MAX_MS = 200
+    POLL_BACKOFF = 1.4
+    POSE_CHECK_EVERY = 5  # polls between pose reads (done early once within 1 mm of the target)
+
+    def __init__(self, use_usb: bool = True, usb_path: str = '/dev/ttyACM0', low_latency: bool = True):
         """
         Initialize Dobot client with official API
 
         Args:
             use_usb: Use USB connection (True) or skip Dobot entirely (False)
             usb_path: USB device path for Dobot (empty string for auto-detect)
+            low_latency: Set the USB-serial latency timer to 1 ms after connecting
         """
         self.use_usb = use_usb
         self.usb_path = usb_path if usb_path else ""  # Empty string for auto-detect
+        self.low_latency = low_latency
         self.connected = False
         self.last_error = ""
         self.api = None
@@ -86,6 +95,11 @@ class DobotClient:
 
                 logger.info(f"✅ Connected to Dobot on {self.actual_port}")
 
+                # The DLL owns the serial handle, so only the sysfs timer can be changed
+                # (needs a known port - skipped when auto-detecting)
+                if self.low_latency and self.usb_path:
+                    self._set_latency_timer(self.usb_path)
+
                 # CRITICAL: Initialize robot parameters before any movement
                 self._initialize_robot()
 
@@ -98,11 +112,23 @@ class DobotClient:
 
         except Exception as e:
             self.last_error = f"Connection error: {str(e)}"
-            logger.error(f"❌ {self.last_error}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ {self.last_error}")
             return False
 
+    @staticmethod
+    def _set_latency_timer(port: str):
+        """
+        Set the USB-serial latency timer to 1 ms so the driver delivers responses immediately
+        instead of after its 16 ms default - every queued-index poll and pose read waits on it
+        """
+        timer_path = f"/sys/bus/usb-serial/devices/{os.path.basename(os.path.realpath(port))}/latency_timer"
+        try:
+            with open(timer_path, 'w') as f:
+                f.write('1')
+            logger.info(f"⚡ Serial latency timer set to 1 ms ({timer_path})")
+        except OSError as e:
+            logger.debug(f"Could not set serial latency timer: {e}")
+
     def _initialize_robot(self):
         """Initialize robot parameters - MUST be called after connection"""
         if not self.api:
@@ -117,7 +143,7 @@ class DobotClient:
                 accelerationRatio=self.acceleration_ratio,
                 isQueued=1
             )
-            logger.info(f"✅ Set PTP params: velocity={self.velocity_ratio}%, accel={self.acceleration_ratio}%")
+            logger.info("✅ Set PTP params: velocity=%s%%, accel=%s%%", self.velocity_ratio, self.acceleration_ratio)
 
             # Set PTP coordinate parameters (for different movement modes)
             dType.SetPTPCoordinateParams(
@@ -139,7 +165,7 @@ class DobotClient:
                 r=self.HOME_POSITION['r'],
                 isQueued=1
             )
-            logger.info(f"✅ Set home position: {self.HOME_POSITION}")
+            logger.info("✅ Set home position: %s", self.HOME_POSITION)
 
             # Clear any existing queued commands
             dType.SetQueuedCmdClear(self.api)
@@ -149,9 +175,7 @@ class DobotClient:
             dType.SetDeviceSN(self.api, "1234567890")  # Doesn't matter for single device
 
         except Exception as e:
-            logger.error(f"❌ Error initializing robot: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Error initializing robot: {e}")
 
     def disconnect(self):
         """Disconnect from Dobot"""
@@ -203,7 +227,7 @@ class DobotClient:
             return False
 
         try:
-            logger.info(f"🤖 Executing move_to({x}, {y}, {z}, {r}, wait={wait})")
+            logger.info("🤖 Executing move_to(%s, %s, %s, %s, wait=%s)", x, y, z, r, wait)
 
             # Queue the movement command
             # PTPMode.PTPMOVLXYZMode = Linear movement in XYZ space
@@ -215,7 +239,7 @@ class DobotClient:
             )
             self.last_index = result[0]
 
-            logger.info(f"✅ Move command queued with index: {self.last_index}")
+            logger.info("✅ Move command queued with index: %s", self.last_index)
 
             # Start executing the queued commands
             dType.SetQueuedCmdStartExec(self.api)
@@ -223,34 +247,48 @@ class DobotClient:
 
             # Wait for completion if requested
             if wait:
-                logger.info(f"⏳ Waiting for movement to complete (index {self.last_index})...")
+                logger.info("⏳ Waiting for movement to complete (index %s)...", self.last_index)
                 timeout = 30  # 30 second timeout
                 start_time = time.time()
+                delay_ms = self.POLL_DELAY_MIN_MS
+                final_pose = None
+                polls = 0
 
                 while True:
                     current_index = dType.GetQueuedCmdCurrentIndex(self.api)[0]
 
                     if current_index >= self.last_index:
-                        logger.info(f"✅ Movement completed (current index: {current_index})")
+                        logger.info("✅ Movement completed (current index: %s)", current_index)
                         break
 
                     if time.time() - start_time > timeout:
                         logger.warning(f"⚠️ Movement timeout after {timeout}s")
                         break
 
-                    dType.dSleep(50)  # Sleep 50ms between checks
-
-                # Verify we reached the target
-                final_pose = self.get_pose()
-                logger.info(f"📍 Final position: X={final_pose['x']:.2f}, Y={final_pose['y']:.2f}, Z={final_pose['z']:.2f}")
+                    polls += 1
+                    # Pose shortcut only for our own move: earlier queued commands may pass through the target
+                    if polls % self.POSE_CHECK_EVERY == 0 and current_index >= self.last_index - 1:
+                        pose = self.get_pose()
+                        if (abs(pose['x'] - x) + abs(pose['y'] - y) + abs(pose['z'] - z)
+                                + abs(pose['r'] - r)) < 1.0:
+                            logger.info("✅ Movement completed (at target position)")
+                            final_pose = pose
+                            break
+
+                    dType.dSleep(delay_ms)
+                    delay_ms = min(int(delay_ms * self.POLL_BACKOFF), self.POLL_DELAY_MAX_MS)
+
+                # Verify we reached the target (debug only - costs a pose round trip)
+                if logger.isEnabledFor(logging.DEBUG):
+                    if final_pose is None:
+                        final_pose = self.get_pose()
+                    logger.debug("📍 Final position: X=%.2f, Y=%.2f, Z=%.2f", final_pose['x'], final_pose['y'], final_pose['z'])
 
             return True
 
         except Exception as e:
             self.last_error = f"Error moving: {str(e)}"
-            logger.error(f"❌ Move error: {self.last_error}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Move error: {self.last_error}")
             return False
 
     def home(self, wait: bool = True) -> bool:
@@ -263,7 +301,7 @@ class DobotClient:
         Returns:
             True if command sent successfully, False otherwise
         """
-        logger.info(f"🏠 Homing robot to {self.HOME_POSITION}")
+        logger.info("🏠 Homing robot to %s", self.HOME_POSITION)
         return self.move_to(
             self.HOME_POSITION['x'],
             self.HOME_POSITION['y'],
@@ -320,7 +358,7 @@ class DobotClient:
                 isQueued=1
             )
             dType.SetQueuedCmdStartExec(self.api)
-            logger.info(f"💨 Suction cup {'enabled' if enable else 'disabled'}")
+            logger.info("💨 Suction cup %s", 'enabled' if enable else 'disabled')
         except Exception as e:
             logger.error(f"❌ Error setting suction: {e}")
 
@@ -345,7 +383,7 @@ class DobotClient:
                 isQueued=1
             )
             dType.SetQueuedCmdStartExec(self.api)
-            logger.info(f"✋ Gripper {'opened' if open_gripper else 'closed'}")
+            logger.info("✋ Gripper %s", 'opened' if open_gripper else 'closed')
         except Exception as e:
             logger.error(f"❌ Error controlling gripper: {e}")
 
@@ -370,7 +408,7 @@ class DobotClient:
                 accelerationRatio=self.acceleration_ratio,
                 isQueued=1
             )
-            logger.info(f"✅ Speed set: velocity={self.velocity_ratio}%, accel={self.acceleration_ratio}%")
+            logger.info("✅ Speed set: velocity=%s%%, accel=%s%%", self.velocity_ratio, self.acceleration_ratio)
         except Exception as e:
             logger.error(f"❌ Error setting speed: {e}")
 
@@ -389,8 +427,10 @@ class DobotClient:
     @staticmethod
     def find_dobot_ports() -> List[str]:
         """Find all potential Dobot USB ports (for compatibility)"""
-        import glob
-        ports = []
-        ports.extend(glob.glob('/dev/ttyACM*'))
-        ports.extend(glob.glob('/dev/ttyUSB*'))
+        # One pass over /dev for both name patterns
+        try:
+            with os.scandir('/dev') as entries:
+                ports = [entry.path for entry in entries if entry.name.startswith(('ttyACM', 'ttyUSB'))]
+        except OSError:
+            return []
         return sorted(ports)
@@ -10,7 +10,8 @@ module.exports = {
       watch: false,
       max_memory_restart: '400M',
       env: {
-        NODE_ENV: 'production'
+        NODE_ENV: 'production',
+        NUMBA_CACHE_DIR: '/var/cache/dobot/numba'
       },
       error_file: '/home/pi/logs/pwa-dobot-plc-error.log',
       out_file: '/home/pi/logs/pwa-dobot-plc-out.log',
@@ -20,6 +20,9 @@ source venv/bin/activate
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# Byte-compile the backend now so the first boot doesn't spend time compiling it
+python -m compileall -q .
+
 # Set up USB permissions
 echo "🔐 Setting up USB permissions..."
 sudo usermod -a -G dialout $USER
@@ -38,6 +41,10 @@ fi
 # Create logs directory
 mkdir -p ~/logs
 
+# Persistent cache for compiled camera kernels (NUMBA_CACHE_DIR in ecosystem.config.js)
+sudo mkdir -p /var/cache/dobot/numba
+sudo chown -R $USER /var/cache/dobot
+
 echo ""
 echo "✅ Installation complete!"
 echo ""
@@ -0,0 +1,127 @@
+"""
+Camera kernel backend tests
+Checks that the Numba, SciPy and NumPy versions of each camera_kernels function agree,
+so an edit to one backend can't drift from the others unnoticed.
+
+Run: python -m pytest tests/camera
+"""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'pwa-dobot-plc', 'backend'))
+
+import camera_kernels as kernels  # noqa: E402
+
+requires_numba = pytest.mark.skipif(not kernels.NUMBA_AVAILABLE, reason="numba not installed")
+requires_scipy = pytest.mark.skipif(not kernels.SCIPY_AVAILABLE, reason="scipy not installed")
+
+# Backend flags to run the public functions under; unavailable ones are skipped
+NUMBA_FLAGS = [False, pytest.param(True, marks=requires_numba)]
+SCIPY_FLAGS = [False, pytest.param(True, marks=requires_scipy)]
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(1234)
+
+
+def random_pairs(rng, n, m):
+    pairs = rng.integers(0, n, (m, 2)).astype(np.int32)
+    return pairs[pairs[:, 0] != pairs[:, 1]]
+
+
+@pytest.mark.parametrize('use_numba', NUMBA_FLAGS)
+@pytest.mark.parametrize('use_scipy', SCIPY_FLAGS)
+def test_union_find_matches_numpy(monkeypatch, rng, use_numba, use_scipy):
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', use_numba)
+    monkeypatch.setattr(kernels, 'SCIPY_AVAILABLE', use_scipy)
+    for n, m in [(1, 0), (5, 0), (20, 10), (50, 40), (200, 150)]:
+        pairs = random_pairs(rng, n, m)
+        expected = kernels._union_find_numpy(n, pairs)
+        np.testing.assert_array_equal(kernels.union_find(n, pairs), expected)
+        # Labels are each component's smallest index
+        assert all(expected[i] <= i for i in range(n))
+
+
+@pytest.mark.parametrize('use_scipy', SCIPY_FLAGS)
+def test_close_pairs_is_strict(monkeypatch, rng, use_scipy):
+    monkeypatch.setattr(kernels, 'SCIPY_AVAILABLE', use_scipy)
+    for _ in range(50):
+        points = rng.integers(0, 60, (30, 2))
+        radius = int(rng.integers(1, 25))
+        d2 = ((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+        expected = np.argwhere(np.triu(d2 < radius * radius, 1))
+        pairs = kernels.close_pairs(points, radius)
+        assert pairs.dtype == np.int32
+        assert set(map(tuple, pairs.tolist())) == set(map(tuple, expected.tolist()))
+    # Exactly radius apart is not close
+    assert len(kernels.close_pairs(np.array([[0, 0], [3, 4]]), 5)) == 0
+
+
+@requires_numba
+def test_group_boxes_matches_numpy(rng):
+    for n, groups in [(1, 1), (10, 3), (100, 17)]:
+        corners = rng.integers(-50, 500, (n, 2))
+        boxes = np.concatenate((corners, corners + rng.integers(0, 80, (n, 2))), axis=1).astype(np.int32)
+        group_ids = np.concatenate((np.arange(groups), rng.integers(0, groups, n - groups))).astype(np.int64)
+        np.testing.assert_array_equal(kernels._group_boxes_numba(boxes, group_ids, groups),
+                                      kernels._group_boxes_numpy(boxes, group_ids, groups))
+
+
+@pytest.mark.parametrize('use_numba', NUMBA_FLAGS)
+def test_fill_rects_matches_cv2_rectangle(monkeypatch, rng, use_numba):
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', use_numba)
+    image = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    # Includes swapped corners and rectangles hanging off every edge
+    rects = np.array([(10, 10, 40, 30), (50, 60, 20, 15), (-20, -5, 8, 12), (150, 100, 200, 130),
+                      (-30, -30, -10, -10), (70, 5, 70, 5)] + [tuple(r) for r in rng.integers(-20, 180, (20, 4))])
+    expected = image.copy()
+    for x1, y1, x2, y2 in rects.tolist():
+        cv2.rectangle(expected, (x1, y1), (x2, y2), (1, 2, 3), -1)
+    result = kernels.fill_rects(image.copy(), rects, (1, 2, 3))
+    np.testing.assert_array_equal(result, expected)
+
+
+@requires_numba
+def test_disc_stats_matches_numpy(rng):
+    rois = [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for h, w in [(1, 1), (7, 9), (40, 40), (64, 33)]]
+    # Flat greys and saturated primaries hit the hue/saturation edge cases
+    rois += [np.full((5, 5, 3), value, dtype=np.uint8) for value in [(0, 0, 0), (255, 255, 255), (128, 128, 128),
+                                                                    (255, 0, 0), (0, 255, 0), (0, 0, 255)]]
+    # Non-contiguous view into a larger frame, as classify_disc passes
+    rois.append(rng.integers(0, 256, (50, 60, 3), dtype=np.uint8)[5:30, 10:40])
+    for roi in rois:
+        np.testing.assert_allclose(kernels._disc_stats_numba(roi), kernels._disc_stats_numpy(roi),
+                                   rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('use_numba', NUMBA_FLAGS)
+def test_disc_stats_batch_matches_single(monkeypatch, rng, use_numba):
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', use_numba)
+    frame = rng.integers(0, 256, (100, 100, 3), dtype=np.uint8)
+    rois = [frame[0:20, 0:20], frame[30:71, 40:90], rng.integers(0, 256, (3, 8, 3), dtype=np.uint8)]
+    expected = np.array([kernels._disc_stats_numpy(roi) for roi in rois])
+    np.testing.assert_allclose(kernels.disc_stats_batch(rois), expected, rtol=1e-9, atol=1e-9)
+
+
+@requires_numba
+def test_not_blue_mask_matches_numpy(rng):
+    frame = rng.integers(0, 256, (48, 64, 3), dtype=np.uint8)
+    frame[10:20, 10:20] = (200, 60, 20)  # Belt blue
+    for margin, min_blue in [(20, 80), (0, 0), (60, 150)]:
+        np.testing.assert_array_equal(
+            kernels._not_blue_mask_numba(frame, np.empty(frame.shape[:2], dtype=np.uint8), margin, min_blue),
+            kernels._not_blue_mask_numpy(frame, np.empty(frame.shape[:2], dtype=np.uint8), margin, min_blue))
+
+
+@requires_numba
+def test_filter_contours_matches_numpy(rng):
+    stats = np.ascontiguousarray(rng.uniform(0, 200, (200, 5)), dtype=np.float32)
+    stats[::7, 3] = 0  # Zero-height boxes
+    np.testing.assert_array_equal(kernels._filter_contours_numba(stats, 50, 10000, 0.2, 5.0),
+                                  kernels._filter_contours_numpy(stats, 50, 10000, 0.2, 5.0))